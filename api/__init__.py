@@ -5,6 +5,8 @@ Structure:
     api/
     ├── __init__.py          # This file - app factory
     ├── deps.py              # Dependency injection
+    ├── cache.py             # HTTP caching helpers (ETag / Cache-Control)
+    ├── responses.py         # Response classes (orjson-backed JSON)
     └── v1/
         ├── setup/           # Setup wizard endpoints
         ├── dashboard/       # Dashboard/monitoring endpoints
@@ -18,6 +20,7 @@ Usage:
 """
 
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, RedirectResponse, HTMLResponse
@@ -29,6 +32,18 @@ import lelamp.globals as g
 from lelamp.user_data import get_env_path
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """App lifespan: release shared resources on shutdown."""
+    yield
+    from api.deps import close_http_client
+    from api.v1.setup.ai_backend import close_playback_proc
+    from api.v1.setup.audio import close_playback_stream
+    await close_http_client()
+    await close_playback_proc()
+    close_playback_stream()
+
+
 def create_api(
     title: str = "LeLamp API",
     version: str = "1.0.0",
@@ -51,6 +66,7 @@ def create_api(
         docs_url="/api/docs",
         redoc_url="/api/redoc",
         openapi_url="/api/openapi.json",
+        lifespan=_lifespan,
     )
 
     # Share vision service with globals
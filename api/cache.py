@@ -0,0 +1,65 @@
+"""
+HTTP caching helpers for LeLamp API.
+
+Polled read-only endpoints return their payload through etag_response so
+browsers can revalidate with If-None-Match and get a bodyless 304 when
+nothing changed.
+
+Example usage in a route:
+    @router.get("/status")
+    async def get_status(request: Request):
+        return etag_response(request, {"success": True, ...})
+
+Static payloads can be serialized once with encode_json and served with
+etag_bytes_response.
+"""
+
+import hashlib
+import json
+from typing import Any, Tuple
+
+from fastapi import Request, Response
+
+from api.responses import ORJSON_AVAILABLE
+
+if ORJSON_AVAILABLE:
+    import orjson
+
+
+def encode_json(payload: Any) -> Tuple[bytes, str]:
+    """Serialize payload as compact JSON (orjson when installed). Returns (body, etag)."""
+    if ORJSON_AVAILABLE:
+        body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        body = json.dumps(payload, separators=(",", ":")).encode()
+    return body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def etag_bytes_response(
+    request: Request, body: bytes, etag: str, max_age: int = 1
+) -> Response:
+    """Like etag_response, for a body already serialized with encode_json."""
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def etag_response(request: Request, payload: Any, max_age: int = 1) -> Response:
+    """
+    Serialize payload as JSON with ETag and Cache-Control headers.
+
+    Args:
+        request: Incoming request (checked for If-None-Match)
+        payload: JSON-serializable response body
+        max_age: Seconds the client may reuse the response without revalidating
+
+    Returns:
+        304 Not Modified if the client's ETag matches, else the JSON response
+    """
+    body, etag = encode_json(payload)
+    return etag_bytes_response(request, body, etag, max_age)
+
+
+__all__ = ["encode_json", "etag_bytes_response", "etag_response"]
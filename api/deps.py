@@ -12,13 +12,19 @@ Example usage in a route:
         return {"running": animation.is_running()}
 """
 
-from typing import Optional
+import copy
+import mmap
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
 from pathlib import Path
+import httpx
 import yaml
 
 # Import global services
 import lelamp.globals as g
-from lelamp.user_data import get_config_path, USER_CONFIG_FILE
+from lelamp.user_data import get_config_path, USER_CONFIG_FILE, USER_ENV_FILE
 
 
 def get_config() -> dict:
@@ -26,21 +32,227 @@ def get_config() -> dict:
     return g.CONFIG
 
 
+# Config as last read from / written to disk, with the file's stat stamp at
+# that point. load_config re-parses only when the file changes; save_config
+# skips rewriting a config that hasn't changed.
+_disk_snapshot = {"stamp": None, "config": None}
+
+# Serializes config writers so concurrent update_config calls (event loop and
+# worker threads) can't lose each other's changes
+_config_lock = threading.RLock()
+
+# libyaml's C loader/emitter when available (much faster than the
+# pure-Python ones)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _config_stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    """(mtime_ns, size, inode) of the config file, or None if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _record_snapshot(stamp: Optional[Tuple[int, int, int]], config: dict) -> None:
+    _disk_snapshot["stamp"] = stamp
+    _disk_snapshot["config"] = copy.deepcopy(config)
+
+
+def _read_config_file(path: Path) -> dict:
+    """Parse the YAML config via a read-only mmap of the file."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return yaml.load(mm, Loader=_YAML_LOADER) or {}
+
+
 def load_config() -> dict:
-    """Load config from disk (fresh read from ~/.lelamp/config.yaml)."""
+    """
+    Load config from disk (~/.lelamp/config.yaml).
+
+    The file is only re-parsed when it changes on disk; otherwise a copy of
+    the last parsed config is returned. Callers may modify the result.
+    """
     config_path = get_config_path()
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f) or {}
+    stamp = _config_stamp(config_path)
+    if stamp is not None and stamp == _disk_snapshot["stamp"]:
+        return copy.deepcopy(_disk_snapshot["config"])
+
+    config = _read_config_file(config_path)
+    _record_snapshot(stamp, config)
+    return config
+
+
+def read_config() -> dict:
+    """
+    Like load_config, but returns the cached config itself instead of a copy.
+
+    For read-only callers (GET handlers); the result must not be modified.
+    """
+    stamp = _config_stamp(get_config_path())
+    if stamp is None or stamp != _disk_snapshot["stamp"]:
+        return load_config()  # Parses and refreshes the snapshot
+    return _disk_snapshot["config"]
 
 
 def save_config(config: dict) -> None:
-    """Save config to disk (~/.lelamp/config.yaml) and update in-memory copy."""
-    # Update the in-memory global config so other services see the changes
-    g.CONFIG = config
+    """
+    Save config to disk (~/.lelamp/config.yaml) and update in-memory copy.
+
+    The write is skipped if the config equals what is already on disk.
+    """
+    with _config_lock:
+        # Update the in-memory global config so other services see the changes
+        g.CONFIG = config
+
+        if (config == _disk_snapshot["config"]
+                and _config_stamp(USER_CONFIG_FILE) == _disk_snapshot["stamp"]):
+            return  # Unchanged since last read/write
+
+        # Always save to user config location. Write to a temp file, flush it
+        # to disk and rename, so readers never see a half-written config and a
+        # power cut can't leave an empty one behind.
+        data = yaml.dump(config, Dumper=_YAML_DUMPER, encoding="utf-8",
+                         default_flow_style=False, sort_keys=False)
+        tmp_path = USER_CONFIG_FILE.with_name(USER_CONFIG_FILE.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, USER_CONFIG_FILE)
+        _record_snapshot(_config_stamp(USER_CONFIG_FILE), config)
+
+
+def _deep_merge(dst: dict, src: dict) -> dict:
+    """Recursively merge src into dst (nested dicts merged, other values replaced)."""
+    for key, value in src.items():
+        if isinstance(value, dict) and isinstance(dst.get(key), dict):
+            _deep_merge(dst[key], value)
+        else:
+            dst[key] = value
+    return dst
+
+
+def update_config(patch: dict) -> dict:
+    """
+    Apply a nested partial update to the config and save it.
+
+    Loads once, deep-merges patch, saves once, all under a lock so concurrent
+    updates don't overwrite each other. For example:
+        update_config({"vision": {"enabled": True}})
+
+    Returns the updated config.
+    """
+    return edit_config(lambda config: _deep_merge(config, patch))
+
+
+def edit_config(edit: Callable[[dict], Any]) -> dict:
+    """
+    Load the config, let edit(config) modify it in place, and save it.
+
+    Like update_config, but for changes a merge can't express (replacing a
+    section, values derived from the current config). The whole
+    load/edit/save runs under the config lock. Call it (and update_config)
+    from a worker thread in async code, e.g.
+    await asyncio.to_thread(edit_config, fn).
+
+    Returns the updated config.
+    """
+    with _config_lock:
+        config = load_config()
+        edit(config)
+        save_config(config)
+        return config
+
+
+# KEY=VALUE lines of a .env file (comment lines skipped); split at first "="
+_ENV_LINE_RE = re.compile(r"^(?!#)([^=\n]*)=(.*)$", re.MULTILINE)
+
+# Parsed .env files: path -> ((mtime_ns, size, inode), values)
+_env_cache: Dict[Path, Tuple[Tuple[int, int, int], Dict[str, str]]] = {}
+
+
+def load_env(env_path: Optional[Path] = None) -> Dict[str, str]:
+    """
+    Parse KEY=VALUE lines from a .env file (default ~/.lelamp/.env).
+
+    The parsed dict is cached and only re-read when the file's mtime, size
+    or inode changes (update_env replaces the inode, so its writes are
+    always picked up). Treat the result as read-only; copy it before modifying.
+    Returns an empty dict if the file doesn't exist.
+    """
+    env_path = Path(env_path or USER_ENV_FILE)
+    try:
+        st = os.stat(env_path)
+    except OSError:
+        _env_cache.pop(env_path, None)
+        return {}
+
+    stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+    cached = _env_cache.get(env_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    # Last definition of a key wins, as with python-dotenv (installers append
+    # updated keys with >>)
+    values = {
+        key.strip(): value.strip()
+        for key, value in _ENV_LINE_RE.findall(env_path.read_text())
+    }
+
+    _env_cache[env_path] = (stamp, values)
+    return values
+
+
+def update_env(updates: Dict[str, str], env_path: Optional[Path] = None) -> None:
+    """
+    Merge updates into a .env file (default ~/.lelamp/.env) and rewrite it.
+
+    Keys with empty values are dropped. The new content is written to a
+    0600 temp file and renamed over the original, so readers never see a
+    truncated file.
+    """
+    env_path = Path(env_path or USER_ENV_FILE)
+    env_path.parent.mkdir(parents=True, exist_ok=True)
+
+    values = dict(load_env(env_path))
+    values.update(updates)
+    data = "".join(f"{key}={value}\n" for key, value in values.items() if value)
+
+    tmp_path = env_path.with_name(env_path.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        os.fchmod(fd, 0o600)  # In case a stale temp file had other permissions
+        f.write(data.encode())
+    os.replace(tmp_path, env_path)
+
+
+# Shared outbound HTTP client (connection pool, keep-alive). Created lazily on
+# the server's event loop and closed on app shutdown.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared AsyncClient for outbound requests (e.g. to the Hub)."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+    return _http_client
+
 
-    # Always save to user config location
-    with open(USER_CONFIG_FILE, 'w') as f:
-        yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+async def close_http_client() -> None:
+    """Close the shared AsyncClient (called on app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
 def get_animation_service():
@@ -131,7 +343,10 @@ __all__ = [
     "get_config",
     "get_config_path",
     "load_config",
+    "read_config",
     "save_config",
+    "update_config",
+    "edit_config",
     "get_animation_service",
     "get_rgb_service",
     "get_vision_service",
@@ -0,0 +1,22 @@
+"""
+Response classes for LeLamp API.
+
+FastJSONResponse serializes with orjson when it is installed and falls back
+to the standard JSONResponse otherwise. Use it for routers whose endpoints
+are polled by the setup UI:
+
+    router = APIRouter(default_response_class=FastJSONResponse)
+"""
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:
+    import orjson  # noqa: F401 - required by ORJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+FastJSONResponse = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
+
+__all__ = ["FastJSONResponse", "ORJSON_AVAILABLE"]
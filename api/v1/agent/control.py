@@ -9,7 +9,7 @@ import asyncio
 
 from fastapi import APIRouter
 
-from api.deps import get_lelamp_agent, get_agent_session, load_config, save_config
+from api.deps import get_lelamp_agent, get_agent_session, load_config, update_config
 
 router = APIRouter()
 
@@ -100,10 +100,7 @@ async def get_agent_enabled():
 async def enable_agent():
     """Enable the AI agent in config (requires service restart)."""
     try:
-        config = load_config()
-        config.setdefault("agent", {})
-        config["agent"]["enabled"] = True
-        save_config(config)
+        await asyncio.to_thread(update_config, {"agent": {"enabled": True}})
         return {
             "success": True,
             "message": "Agent enabled. Restart the service for changes to take effect.",
@@ -117,10 +114,7 @@ async def enable_agent():
 async def disable_agent():
     """Disable the AI agent in config (requires service restart)."""
     try:
-        config = load_config()
-        config.setdefault("agent", {})
-        config["agent"]["enabled"] = False
-        save_config(config)
+        await asyncio.to_thread(update_config, {"agent": {"enabled": False}})
         return {
             "success": True,
             "message": "Agent disabled. Restart the service for changes to take effect.",
@@ -1,6 +1,7 @@
 """
 Character/personality management API endpoints.
 """
+import asyncio
 import os
 import json
 import logging
@@ -8,7 +9,7 @@ from pathlib import Path
 
 from fastapi import APIRouter, Request
 
-from api.deps import get_config, save_config
+from api.deps import get_config, update_config
 
 router = APIRouter()
 
@@ -63,18 +64,14 @@ async def update_character(request: Request):
         char_id = Path(character_file).stem
 
         # Update config with full personality info
-        config = get_config()
-        if "personality" not in config:
-            config["personality"] = {}
-
-        config["personality"]["character_file"] = character_file
-        config["personality"]["character_id"] = char_id
-        config["personality"]["name"] = char_data.get("name", char_id)
-        config["personality"]["description"] = char_data.get("description", "")
-        config["personality"]["speech_style"] = char_data.get("speech_style", "")
-        config["personality"]["voice_model"] = char_data.get("voice_model", "alloy")
-
-        save_config(config)
+        await asyncio.to_thread(update_config, {"personality": {
+            "character_file": character_file,
+            "character_id": char_id,
+            "name": char_data.get("name", char_id),
+            "description": char_data.get("description", ""),
+            "speech_style": char_data.get("speech_style", ""),
+            "voice_model": char_data.get("voice_model", "alloy"),
+        }})
 
         return {
             "success": True,
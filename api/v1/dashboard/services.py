@@ -10,7 +10,7 @@ import logging
 from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import Optional
-from api.deps import load_config, save_config, get_animation_service, get_lelamp_agent
+from api.deps import load_config, edit_config, update_config, get_animation_service, get_lelamp_agent
 import lelamp.globals as g
 
 router = APIRouter()
@@ -322,9 +322,9 @@ async def toggle_service(request: ServiceToggleRequest):
 
     # Update config for persistence
     config_path = CONFIGURABLE_SERVICES[request.service]
-    config = load_config()
-    set_nested_value(config, config_path, request.enabled)
-    save_config(config)
+    await asyncio.to_thread(
+        edit_config, lambda config: set_nested_value(config, config_path, request.enabled)
+    )
 
     # Apply change at runtime
     status_msg = await _apply_service_change(request.service, request.enabled)
@@ -349,9 +349,9 @@ async def enable_service(service: str):
 
     # Update config
     config_path = CONFIGURABLE_SERVICES[service]
-    config = load_config()
-    set_nested_value(config, config_path, True)
-    save_config(config)
+    await asyncio.to_thread(
+        edit_config, lambda config: set_nested_value(config, config_path, True)
+    )
 
     # Apply change at runtime
     status_msg = await _apply_service_change(service, True)
@@ -376,9 +376,9 @@ async def disable_service(service: str):
 
     # Update config
     config_path = CONFIGURABLE_SERVICES[service]
-    config = load_config()
-    set_nested_value(config, config_path, False)
-    save_config(config)
+    await asyncio.to_thread(
+        edit_config, lambda config: set_nested_value(config, config_path, False)
+    )
 
     # Apply change at runtime
     status_msg = await _apply_service_change(service, False)
@@ -428,11 +428,7 @@ async def set_rgb_brightness(request: RGBBrightnessRequest):
     agent = get_lelamp_agent()
 
     # Update config for persistence
-    config = load_config()
-    if "rgb" not in config:
-        config["rgb"] = {}
-    config["rgb"]["led_brightness"] = brightness
-    save_config(config)
+    await asyncio.to_thread(update_config, {"rgb": {"led_brightness": brightness}})
 
     # Apply immediately if RGB service is available
     if agent and hasattr(agent, 'rgb_service') and agent.rgb_service:
@@ -5,11 +5,12 @@ Handles reading and writing config.yaml settings.
 Also applies certain settings in real-time (volume, RGB, etc.)
 """
 
+import asyncio
 import subprocess
 from fastapi import APIRouter
 from typing import Dict, Any
 
-from api.deps import load_config, save_config
+from api.deps import load_config, update_config
 
 router = APIRouter()
 
@@ -50,17 +51,6 @@ def apply_volume(volume_type: str, volume_percent: int) -> bool:
     return success
 
 
-def deep_merge(base: dict, updates: dict) -> dict:
-    """Deep merge updates into base dict."""
-    result = base.copy()
-    for key, value in updates.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = deep_merge(result[key], value)
-        else:
-            result[key] = value
-    return result
-
-
 @router.get("/")
 async def get_settings():
     """Get all settings from config.yaml."""
@@ -75,9 +65,7 @@ async def get_settings():
 async def update_settings(data: Dict[str, Any]):
     """Save settings to config.yaml (deep merge) and apply real-time changes."""
     try:
-        current_config = load_config()
-        updated_config = deep_merge(current_config, data)
-        save_config(updated_config)
+        await asyncio.to_thread(update_config, data)
 
         # Apply real-time changes for certain settings
         applied = []
@@ -4,13 +4,15 @@ Theme management endpoints.
 Handles listing available themes and switching themes.
 """
 
+import asyncio
+
 from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import List
 import os
 from pathlib import Path
 
-from api.deps import load_config, save_config
+from api.deps import load_config, update_config
 
 router = APIRouter()
 
@@ -61,11 +63,7 @@ async def set_theme(request: ThemeSetRequest):
             return {"success": False, "error": f"Theme '{request.name}' not found"}
 
         # Update config
-        config = load_config()
-        if "theme" not in config:
-            config["theme"] = {}
-        config["theme"]["name"] = request.name
-        save_config(config)
+        await asyncio.to_thread(update_config, {"theme": {"name": request.name}})
 
         # Update the running theme service if available
         try:
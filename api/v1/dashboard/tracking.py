@@ -4,11 +4,13 @@ Face tracking and vision endpoints.
 Provides face detection status and tracking control.
 """
 
+import asyncio
+
 from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 
-from api.deps import get_vision_service, load_config, save_config
+from api.deps import edit_config, get_vision_service, load_config
 
 router = APIRouter()
 
@@ -111,17 +113,16 @@ async def get_tracking_config():
 async def update_tracking_config(data: Dict[str, Any]):
     """Update face tracking configuration."""
     try:
-        config = load_config()
-
-        if 'face_tracking' in data:
-            config.setdefault('face_tracking', {})
-            config['face_tracking'].update(data['face_tracking'])
+        def apply(config: dict) -> None:
+            if 'face_tracking' in data:
+                config.setdefault('face_tracking', {})
+                config['face_tracking'].update(data['face_tracking'])
 
-        if 'vision' in data:
-            config.setdefault('vision', {})
-            config['vision'].update(data['vision'])
+            if 'vision' in data:
+                config.setdefault('vision', {})
+                config['vision'].update(data['vision'])
 
-        save_config(config)
+        await asyncio.to_thread(edit_config, apply)
         return {"success": True, "message": "Tracking config updated"}
     except Exception as e:
         return {"success": False, "error": str(e)}
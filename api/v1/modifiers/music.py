@@ -4,11 +4,13 @@ Music modifier API endpoints.
 Controls the music/beat-sync animation modifier.
 """
 
+import asyncio
+
 from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import List, Optional
 
-from api.deps import get_animation_service, load_config, save_config
+from api.deps import get_animation_service, update_config
 
 router = APIRouter()
 
@@ -137,21 +139,16 @@ async def save_music_modifier_config():
         if not music_mod:
             return {"success": False, "error": "Music modifier not found"}
 
-        config = load_config()
-
         # Update music modifier settings
-        config.setdefault('modifiers', {})
-        config['modifiers'].setdefault('music', {})
-
-        config['modifiers']['music']['enabled'] = animation.is_modifier_enabled("music")
-        config['modifiers']['music']['amplitude'] = music_mod.config.amplitude
-        config['modifiers']['music']['beat_divisor'] = music_mod.config.beat_divisor
-        config['modifiers']['music']['groove'] = music_mod.config.groove
-        config['modifiers']['music']['joints'] = list(music_mod.target_joints)
-        config['modifiers']['music']['dance_threshold'] = animation._dance_threshold
-        config['modifiers']['music']['excited_threshold'] = animation._excited_threshold
-
-        save_config(config)
+        await asyncio.to_thread(update_config, {'modifiers': {'music': {
+            'enabled': animation.is_modifier_enabled("music"),
+            'amplitude': music_mod.config.amplitude,
+            'beat_divisor': music_mod.config.beat_divisor,
+            'groove': music_mod.config.groove,
+            'joints': list(music_mod.target_joints),
+            'dance_threshold': animation._dance_threshold,
+            'excited_threshold': animation._excited_threshold,
+        }}})
         return {"success": True, "message": "Settings saved to config.yaml"}
     except Exception as e:
         return {"success": False, "error": str(e)}
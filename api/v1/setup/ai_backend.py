@@ -9,18 +9,19 @@ Provides endpoints for selecting and configuring the AI backend:
 """
 
 import asyncio
+import io
+import json
 import logging
 import os
-import tempfile
 import wave
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from fastapi import APIRouter
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
-from api.deps import load_config, save_config
+from api.deps import load_config, edit_config, load_env, update_env
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -108,6 +109,9 @@ OPENAI_VOICES = [
     {"id": "verse", "name": "Verse", "description": "Articulate and clear", "gender": "male"},
 ]
 
+# Index for O(1) voice lookup by id
+_OPENAI_VOICES_BY_ID = {v["id"]: v for v in OPENAI_VOICES}
+
 # xAI Grok voices
 GROK_VOICES = [
     {"id": "Charon", "name": "Charon", "description": "Default Grok voice", "gender": "neutral", "default": True},
@@ -218,70 +222,25 @@ def check_env_keys(required_keys: List[str]) -> dict:
     """Check which required env keys are set."""
     from lelamp.user_data import USER_DATA_DIR
 
-    env_path = USER_DATA_DIR / ".env"
-    env_vars = {}
-
-    if env_path.exists():
-        try:
-            for line in env_path.read_text().splitlines():
-                if "=" in line and not line.startswith("#"):
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip()
-                    if value and value not in ('""', "''"):
-                        env_vars[key] = True
-        except Exception:
-            pass
-
-    result = {}
-    for key in required_keys:
-        result[key] = key in env_vars
+    try:
+        env = load_env(USER_DATA_DIR / ".env")
+    except Exception:
+        env = {}
 
-    return result
+    return {
+        key: env.get(key, "") not in ("", '""', "''")
+        for key in required_keys
+    }
 
 
 def get_env_value(key: str) -> Optional[str]:
     """Get a value from .env file."""
     from lelamp.user_data import USER_DATA_DIR
 
-    env_path = USER_DATA_DIR / ".env"
-    if env_path.exists():
-        try:
-            for line in env_path.read_text().splitlines():
-                if "=" in line and not line.startswith("#"):
-                    k, v = line.split("=", 1)
-                    if k.strip() == key:
-                        return v.strip()
-        except Exception:
-            pass
-    return None
-
-
-def update_env_file(updates: dict):
-    """Update .env file with new values."""
-    from lelamp.user_data import USER_DATA_DIR
-
-    env_path = USER_DATA_DIR / ".env"
-    env_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Read existing content
-    existing = {}
-    if env_path.exists():
-        for line in env_path.read_text().splitlines():
-            if "=" in line and not line.startswith("#"):
-                key, value = line.split("=", 1)
-                existing[key.strip()] = value.strip()
-
-    # Merge updates
-    existing.update(updates)
-
-    # Write back
-    with open(env_path, "w") as f:
-        for key, value in existing.items():
-            if value:  # Only write non-empty values
-                f.write(f"{key}={value}\n")
-
-    env_path.chmod(0o600)
+    try:
+        return load_env(USER_DATA_DIR / ".env").get(key)
+    except Exception:
+        return None
 
 
 def get_piper_voices() -> List[dict]:
@@ -302,7 +261,6 @@ def get_piper_voices() -> List[dict]:
 
         if json_path.exists():
             try:
-                import json
                 meta = json.loads(json_path.read_text())
                 # Extract quality from filename
                 if "-high" in voice_id:
@@ -366,11 +324,21 @@ async def validate_openai_key(api_key: str) -> tuple:
         return False, str(e)
 
 
-async def generate_piper_preview(voice_id: str, text: str) -> Optional[str]:
+def get_piper_sample_rate(voice_path: Path) -> int:
+    """Get sample rate for a Piper voice from its JSON metadata."""
+    json_path = voice_path.with_suffix(".onnx.json")
+    try:
+        meta = json.loads(json_path.read_text())
+        return meta.get("audio", {}).get("sample_rate", 22050)
+    except Exception:
+        return 22050  # Default for most Piper voices
+
+
+async def generate_piper_preview(voice_id: str, text: str) -> Optional[Tuple[bytes, int]]:
     """
     Generate a voice preview using Piper TTS.
 
-    Returns path to generated audio file.
+    Returns (raw int16 mono PCM, sample rate), or None on failure.
     """
     if not PIPER_PATH.exists():
         return None
@@ -379,20 +347,16 @@ async def generate_piper_preview(voice_id: str, text: str) -> Optional[str]:
     if not voice_path.exists():
         return None
 
-    # Create temp file for output
-    fd, output_path = tempfile.mkstemp(suffix=".wav")
-    os.close(fd)
-
     try:
         # Set library path for Piper dependencies
         env = os.environ.copy()
         env["LD_LIBRARY_PATH"] = f"{PIPER_PATH.parent}:{env.get('LD_LIBRARY_PATH', '')}"
 
-        # Run Piper to generate audio
+        # Run Piper to generate raw PCM on stdout
         process = await asyncio.create_subprocess_exec(
             str(PIPER_PATH),
             "--model", str(voice_path),
-            "--output_file", output_path,
+            "--output_raw",
             stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
@@ -404,8 +368,8 @@ async def generate_piper_preview(voice_id: str, text: str) -> Optional[str]:
             timeout=30.0
         )
 
-        if process.returncode == 0 and os.path.exists(output_path):
-            return output_path
+        if process.returncode == 0 and stdout:
+            return stdout, get_piper_sample_rate(voice_path)
         else:
             logger.error(f"Piper error: {stderr.decode()}")
             return None
@@ -418,6 +382,151 @@ async def generate_piper_preview(voice_id: str, text: str) -> Optional[str]:
         return None
 
 
+def wav_to_pcm(data: bytes) -> Tuple[bytes, int, int]:
+    """
+    Strip the WAV header from in-memory audio.
+
+    Returns (raw int16 PCM, sample rate, channels).
+    """
+    with wave.open(io.BytesIO(data)) as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"Unsupported sample width: {wf.getsampwidth()}")
+        # Streamed WAVs may carry a bogus frame count; readframes stops at EOF
+        return wf.readframes(wf.getnframes()), wf.getframerate(), wf.getnchannels()
+
+
+# =============================================================================
+# Voice Preview Playback
+# =============================================================================
+
+# Persistent aplay process reading raw PCM from stdin. Reused across previews
+# so back-to-back voice tests skip the fork/exec and ALSA device open; closed
+# once idle for PLAYBACK_IDLE_CLOSE and on app shutdown.
+PLAYBACK_IDLE_CLOSE = 30.0  # seconds
+_playback_proc: Optional[asyncio.subprocess.Process] = None
+_playback_format: Optional[Tuple[int, int]] = None
+_playback_ends_at = 0.0  # loop.time() when the audio written so far finishes
+_playback_lock = asyncio.Lock()
+_playback_idle_task: Optional[asyncio.Task] = None
+_preview_tasks: set = set()  # Running play_pcm tasks (keeps them referenced)
+
+
+async def _stop_playback_proc(drain: bool = True):
+    """
+    Close the persistent aplay process.
+
+    With drain, aplay is given until the audio already written has played
+    (plus a short grace period) before it is killed.
+    """
+    global _playback_proc, _playback_format
+
+    proc = _playback_proc
+    _playback_proc = None
+    _playback_format = None
+    if proc is None:
+        return
+
+    try:
+        proc.stdin.close()
+        remaining = _playback_ends_at - asyncio.get_running_loop().time()
+        timeout = max(0.0, remaining) + 2.0 if drain else 0.5
+        await asyncio.wait_for(proc.wait(), timeout=timeout)
+    except Exception:
+        try:
+            proc.kill()
+            await proc.wait()
+        except Exception:
+            pass
+
+
+async def _get_playback_proc(sample_rate: int, channels: int) -> asyncio.subprocess.Process:
+    """Get the persistent aplay process, (re)starting it if it exited or the format changed."""
+    global _playback_proc, _playback_format
+
+    if _playback_proc is not None and _playback_proc.returncode is None:
+        if _playback_format == (sample_rate, channels):
+            return _playback_proc
+        await _stop_playback_proc()
+
+    _playback_proc = await asyncio.create_subprocess_exec(
+        "aplay", "-q", "-D", "lelamp_playback",
+        "-t", "raw", "-f", "S16_LE",
+        "-r", str(sample_rate), "-c", str(channels),
+        "-",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    _playback_format = (sample_rate, channels)
+    return _playback_proc
+
+
+async def _close_playback_when_idle():
+    """Close aplay once its audio has played out and nothing new arrived."""
+    loop = asyncio.get_running_loop()
+    await asyncio.sleep(max(0.0, _playback_ends_at - loop.time()) + PLAYBACK_IDLE_CLOSE)
+    async with _playback_lock:
+        await _stop_playback_proc()
+
+
+def _schedule_idle_close():
+    """(Re)start the idle close after a write."""
+    global _playback_idle_task
+
+    if _playback_idle_task is not None:
+        _playback_idle_task.cancel()
+    _playback_idle_task = asyncio.create_task(_close_playback_when_idle())
+
+
+async def close_playback_proc():
+    """Stop the persistent aplay process now (called on app shutdown)."""
+    global _playback_idle_task
+
+    if _playback_idle_task is not None:
+        _playback_idle_task.cancel()
+        _playback_idle_task = None
+    for task in list(_preview_tasks):
+        task.cancel()
+    async with _playback_lock:
+        await _stop_playback_proc(drain=False)
+
+
+async def play_pcm(pcm: bytes, sample_rate: int, channels: int = 1):
+    """
+    Play raw int16 PCM on the Pi's speakers via the persistent aplay pipe.
+
+    Serialized with a lock so simultaneous previews don't interleave.
+    """
+    global _playback_ends_at
+
+    async with _playback_lock:
+        for attempt in range(2):
+            proc = await _get_playback_proc(sample_rate, channels)
+            try:
+                proc.stdin.write(pcm)
+                await proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                logger.warning("aplay pipe broken, restarting")
+                await _stop_playback_proc(drain=False)
+                continue
+            except Exception as e:
+                logger.error(f"Error playing audio: {e}")
+                return
+
+            now = asyncio.get_running_loop().time()
+            duration = len(pcm) / (2 * channels * sample_rate)
+            _playback_ends_at = max(now, _playback_ends_at) + duration
+            _schedule_idle_close()
+            return
+
+
+def start_preview(pcm: bytes, sample_rate: int, channels: int = 1) -> None:
+    """Play a preview in the background (the request doesn't wait for it)."""
+    task = asyncio.create_task(play_pcm(pcm, sample_rate, channels))
+    _preview_tasks.add(task)
+    task.add_done_callback(_preview_tasks.discard)
+
+
 # =============================================================================
 # API Endpoints
 # =============================================================================
@@ -631,36 +740,18 @@ async def test_voice(request: VoiceTestRequest):
 
         if request.backend == "local":
             # Generate audio using Piper
-            audio_path = await generate_piper_preview(request.voice_id, text)
-
-            if audio_path:
-                # Play on the Pi's speakers using aplay
-                try:
-                    import subprocess
-                    process = await asyncio.create_subprocess_exec(
-                        "aplay", audio_path,
-                        stdout=asyncio.subprocess.DEVNULL,
-                        stderr=asyncio.subprocess.DEVNULL,
-                    )
-                    # Don't wait for completion - let it play in background
-                    asyncio.create_task(_cleanup_after_playback(process, audio_path))
-
-                    return {
-                        "success": True,
-                        "message": "Playing voice preview on device",
-                        "voice_id": request.voice_id
-                    }
-                except Exception as e:
-                    logger.error(f"Error playing audio: {e}")
-                    # Fallback: try to clean up
-                    try:
-                        os.unlink(audio_path)
-                    except Exception:
-                        pass
-                    return {
-                        "success": False,
-                        "error": f"Failed to play audio: {e}"
-                    }
+            preview = await generate_piper_preview(request.voice_id, text)
+
+            if preview:
+                # Play on the Pi's speakers - don't wait for completion
+                pcm, sample_rate = preview
+                start_preview(pcm, sample_rate)
+
+                return {
+                    "success": True,
+                    "message": "Playing voice preview on device",
+                    "voice_id": request.voice_id
+                }
             else:
                 return {
                     "success": False,
@@ -669,7 +760,7 @@ async def test_voice(request: VoiceTestRequest):
 
         elif request.backend in ("livekit", "livekit-realtime"):
             # Generate preview using OpenAI TTS API
-            voice_info = next((v for v in OPENAI_VOICES if v["id"] == request.voice_id), None)
+            voice_info = _OPENAI_VOICES_BY_ID.get(request.voice_id)
 
             if not voice_info:
                 return {
@@ -691,7 +782,6 @@ async def test_voice(request: VoiceTestRequest):
 
             try:
                 import httpx
-                import tempfile
 
                 # Map Realtime-only voices to TTS equivalents for preview
                 tts_voice = REALTIME_TO_TTS_VOICE.get(request.voice_id, request.voice_id)
@@ -713,19 +803,9 @@ async def test_voice(request: VoiceTestRequest):
                     )
 
                     if response.status_code == 200:
-                        # Save to temp file and play
-                        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                            f.write(response.content)
-                            audio_path = f.name
-
-                        # Play on the Pi's speakers
-                        import subprocess
-                        process = await asyncio.create_subprocess_exec(
-                            "aplay", "-D", "lelamp_playback", audio_path,
-                            stdout=asyncio.subprocess.DEVNULL,
-                            stderr=asyncio.subprocess.DEVNULL,
-                        )
-                        asyncio.create_task(_cleanup_after_playback(process, audio_path))
+                        # Play on the Pi's speakers - don't wait for completion
+                        pcm, sample_rate, channels = wav_to_pcm(response.content)
+                        start_preview(pcm, sample_rate, channels)
 
                         # Note if using substitute voice for preview
                         if tts_voice != request.voice_id:
@@ -766,19 +846,6 @@ async def test_voice(request: VoiceTestRequest):
         }
 
 
-async def _cleanup_after_playback(process, audio_path: str):
-    """Wait for playback to finish then clean up temp file."""
-    try:
-        await process.wait()
-    except Exception:
-        pass
-    finally:
-        try:
-            os.unlink(audio_path)
-        except Exception:
-            pass
-
-
 @router.post("/configure")
 async def configure_ai_backend(request: AIBackendConfigRequest):
     """
@@ -838,54 +905,55 @@ async def configure_ai_backend(request: AIBackendConfigRequest):
 
         # Update .env file
         if env_updates:
-            update_env_file(env_updates)
-
-        # Update config
-        config = load_config()
-
-        config.setdefault("pipeline", {})
-        config["pipeline"]["type"] = backend
-
-        if backend == "livekit-realtime":
-            # Provider setting
-            provider = request.provider or "openai"
-            config["pipeline"]["provider"] = provider
-
-            # Voice setting - use new voice field or legacy openai_voice
-            voice = request.voice or request.openai_voice
-            if voice:
-                config["pipeline"]["voice"] = voice
-            elif "voice" not in config["pipeline"]:
-                # Set default voice for provider
-                from lelamp.pipelines.livekit_realtime import DEFAULT_VOICES
-                config["pipeline"]["voice"] = DEFAULT_VOICES.get(provider, "ballad")
-
-            # Keep legacy field for backwards compatibility
-            config["pipeline"]["openai_voice"] = config["pipeline"]["voice"]
-
-        elif backend == "local":
-            config["pipeline"].setdefault("local", {})
-
-            if request.ollama_url:
-                config["pipeline"]["local"]["ollama_url"] = request.ollama_url
-            if request.ollama_model:
-                config["pipeline"]["local"]["ollama_model"] = request.ollama_model
-            if request.whisper_model:
-                config["pipeline"]["local"]["whisper_model"] = request.whisper_model
-            if request.piper_voice:
-                config["pipeline"]["local"]["voice"] = request.piper_voice
-
-        # Enable agent
-        config.setdefault("agent", {})
-        config["agent"]["enabled"] = True
-
-        # Mark setup step complete
-        config.setdefault("setup", {})
-        config["setup"].setdefault("steps_completed", {})
-        config["setup"]["steps_completed"]["ai_backend"] = True
-        config["setup"]["steps_completed"]["environment"] = True  # Also mark old step
-
-        save_config(config)
+            await asyncio.to_thread(update_env, env_updates)
+
+        provider = request.provider or "openai"
+
+        # Update config (under the config lock; the default voice depends on
+        # what's already there)
+        def apply(config: dict) -> None:
+            config.setdefault("pipeline", {})
+            config["pipeline"]["type"] = backend
+
+            if backend == "livekit-realtime":
+                # Provider setting
+                config["pipeline"]["provider"] = provider
+
+                # Voice setting - use new voice field or legacy openai_voice
+                voice = request.voice or request.openai_voice
+                if voice:
+                    config["pipeline"]["voice"] = voice
+                elif "voice" not in config["pipeline"]:
+                    # Set default voice for provider
+                    from lelamp.pipelines.livekit_realtime import DEFAULT_VOICES
+                    config["pipeline"]["voice"] = DEFAULT_VOICES.get(provider, "ballad")
+
+                # Keep legacy field for backwards compatibility
+                config["pipeline"]["openai_voice"] = config["pipeline"]["voice"]
+
+            elif backend == "local":
+                config["pipeline"].setdefault("local", {})
+
+                if request.ollama_url:
+                    config["pipeline"]["local"]["ollama_url"] = request.ollama_url
+                if request.ollama_model:
+                    config["pipeline"]["local"]["ollama_model"] = request.ollama_model
+                if request.whisper_model:
+                    config["pipeline"]["local"]["whisper_model"] = request.whisper_model
+                if request.piper_voice:
+                    config["pipeline"]["local"]["voice"] = request.piper_voice
+
+            # Enable agent
+            config.setdefault("agent", {})
+            config["agent"]["enabled"] = True
+
+            # Mark setup step complete
+            config.setdefault("setup", {})
+            config["setup"].setdefault("steps_completed", {})
+            config["setup"]["steps_completed"]["ai_backend"] = True
+            config["setup"]["steps_completed"]["environment"] = True  # Also mark old step
+
+        await asyncio.to_thread(edit_config, apply)
 
         # Build response message
         if backend == "livekit-realtime":
@@ -10,28 +10,107 @@ Provides endpoints for testing and configuring audio hardware:
 import asyncio
 import json
 import logging
-import subprocess
+import math
+import os
+import re
+import struct
 import tempfile
 import threading
+import time
 import wave
-from pathlib import Path
-from typing import Optional, Dict, Any, List
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple
 
-from fastapi import APIRouter, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, BackgroundTasks, Request, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
-from api.deps import load_config, save_config
+from api.cache import etag_response
+from api.deps import load_config, update_config
+from api.responses import FastJSONResponse
+
+import numpy as np
+
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError):  # OSError: PortAudio library missing
+    SOUNDDEVICE_AVAILABLE = False
+    sd = None
+
+# Optional JIT for the waveform block kernel; falls back to numpy
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    njit = None
+
+# Optional in-process ALSA mixer access (pyalsaaudio); falls back to amixer
+try:
+    import alsaaudio
+    ALSAAUDIO_AVAILABLE = True
+except ImportError:
+    ALSAAUDIO_AVAILABLE = False
+    alsaaudio = None
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Volume percentage in `amixer sget` output, e.g. "Mono: Playback 38 [75%] [-12.00dB]"
+_PCT_RE = re.compile(rb'\[(\d+)%\]')
+
+# Card line in `aplay -l` / `arecord -l` output, e.g.
+# "card 0: vc4hdmi0 [vc4-hdmi-0], device 0: MAI PCM i2s-hifi-0 [MAI PCM i2s-hifi-0]"
+_CARD_RE = re.compile(rb'^card (\d+):\s*(\S+)\s*(?:\[([^\]]+)\])?', re.MULTILINE)
+
 # Audio monitoring state (global for this module)
 _monitoring_active = False
 _monitoring_thread: Optional[threading.Thread] = None
 _monitoring_stop_event = threading.Event()
 
+# Persistent mic level stream: a ring buffer of recent int16 blocks, kept open
+# while mic monitoring or calibration is active so /mic-level avoids a
+# PortAudio open/close per request
+MIC_LEVEL_SAMPLE_RATE = 24000  # Standardized sample rate
+MIC_LEVEL_SAMPLES = int(MIC_LEVEL_SAMPLE_RATE * 0.05)  # 50ms
+MIC_LEVEL_BLOCKSIZE = MIC_LEVEL_SAMPLES // 3
+_MIC_LEVEL_SCALE = 100.0 / 10000  # level = rms / 10000 * 100
+_level_stream = None
+_level_stream_holders: set = set()
+_level_stream_lock = threading.Lock()
+_level_blocks: deque = deque(maxlen=3)
+
+# Output stream reused across test playbacks (opened on first use). It is
+# stopped after each playback and closed once idle for PLAYBACK_IDLE_CLOSE.
+PLAYBACK_IDLE_CLOSE = 10.0  # seconds
+_playback_stream = None
+_playback_stream_lock = threading.Lock()
+_playback_close_timer: Optional[threading.Timer] = None
+
 # Speaker test state (for non-blocking playback)
-_speaker_test_process: Optional[subprocess.Popen] = None
+_speaker_test_thread: Optional[threading.Thread] = None
+_speaker_test_stop = threading.Event()
+_speaker_test_playing = threading.Event()  # Set by the writer while it runs
+_test_sound_cache: Optional[Tuple[str, Any, int]] = None  # (path, frames, samplerate)
+
+# Speaker test sound, with fallbacks to any available sound
+TEST_SOUND_CANDIDATES = (
+    "/home/administrator/lelamp_v3_runtime/assets/setup/LeLamp-SpeakerTest.wav",
+    "/home/administrator/lelamp_v3_runtime/assets/AudioFX/Effects/Scifi-PositiveDigitization.wav",
+    "/home/administrator/lelamp_v3_runtime/assets/Theme/Lelamp/audio/Notify.wav",
+)
+
+# Last (card, control) that worked per volume type, tried before probing
+_working_mixer: Dict[str, Optional[Tuple[Optional[str], str]]] = {"speaker": None, "microphone": None}
+
+# Open alsaaudio.Mixer handles keyed by (card, control)
+_alsa_mixers: Dict[Tuple[Optional[str], str], Any] = {}
+
+# Audio device enumeration cache (hardware rarely changes, avoids forking
+# aplay/arecord on every /status poll)
+DEVICES_CACHE_TTL = 10.0  # seconds
+_devices_cache: Dict[str, Any] = {"ts": 0.0, "value": None}
+_devices_lock = asyncio.Lock()
 
 
 # =============================================================================
@@ -55,65 +134,160 @@ class AudioDevice(BaseModel):
 # Helper Functions
 # =============================================================================
 
-def get_audio_devices() -> Dict[str, List[AudioDevice]]:
-    """Get available audio devices."""
-    devices = {"playback": [], "capture": []}
+async def _run_command(cmd: List[str], timeout: float, capture_output: bool = True) -> Tuple[int, bytes]:
+    """
+    Run a command without blocking the event loop.
 
+    Returns (returncode, stdout). stdout is left as raw bytes; callers match
+    it with byte regexes and decode only the fields they keep. With
+    capture_output=False, output goes to /dev/null (no pipes) and stdout is
+    b"". Raises asyncio.TimeoutError on timeout.
+    """
+    output = asyncio.subprocess.PIPE if capture_output else asyncio.subprocess.DEVNULL
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=output, stderr=output)
     try:
-        # Get playback devices
-        result = subprocess.run(
-            ["aplay", "-l"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            for line in result.stdout.splitlines():
-                if line.startswith("card"):
-                    # Parse: "card 0: vc4hdmi0 [vc4-hdmi-0], device 0: MAI PCM..."
-                    try:
-                        parts = line.split(":")
-                        card_num = int(parts[0].split()[1])
-                        name = parts[1].split("[")[1].split("]")[0] if "[" in parts[1] else parts[1].strip()
-                        devices["playback"].append(AudioDevice(
-                            name=name,
-                            card_index=card_num,
-                            device_type="playback"
-                        ))
-                    except Exception:
-                        pass
-
-        # Get capture devices
-        result = subprocess.run(
-            ["arecord", "-l"],
-            capture_output=True,
-            text=True,
-            timeout=5
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, stdout or b""
+
+
+async def get_audio_devices() -> Dict[str, List[AudioDevice]]:
+    """Get available audio devices (cached for DEVICES_CACHE_TTL seconds)."""
+    async with _devices_lock:
+        cached = _devices_cache["value"]
+        if cached is not None and time.monotonic() - _devices_cache["ts"] < DEVICES_CACHE_TTL:
+            return cached
+
+        devices = await _enumerate_audio_devices()
+        _devices_cache["value"] = devices
+        _devices_cache["ts"] = time.monotonic()
+        return devices
+
+
+async def _enumerate_audio_devices() -> Dict[str, List[AudioDevice]]:
+    """Enumerate audio devices via aplay -l / arecord -l (run concurrently)."""
+    playback, capture = await asyncio.gather(
+        _list_cards("aplay", "playback"),
+        _list_cards("arecord", "capture"),
+    )
+    return {"playback": playback, "capture": capture}
+
+
+async def _list_cards(cmd_name: str, device_type: str) -> List[AudioDevice]:
+    """List sound cards reported by `aplay -l` or `arecord -l`."""
+    try:
+        returncode, stdout = await _run_command([cmd_name, "-l"], timeout=5)
+    except Exception as e:
+        logger.error(f"Error getting {device_type} devices: {e}")
+        return []
+    return _parse_cards(stdout, device_type) if returncode == 0 else []
+
+
+def _parse_cards(stdout: bytes, device_type: str) -> List[AudioDevice]:
+    """Parse card lines from `aplay -l` / `arecord -l` output."""
+    return [
+        AudioDevice(
+            name=(match.group(3) or match.group(2)).decode("ascii", "replace"),
+            card_index=int(match.group(1)),
+            device_type=device_type,
         )
-        if result.returncode == 0:
-            for line in result.stdout.splitlines():
-                if line.startswith("card"):
-                    try:
-                        parts = line.split(":")
-                        card_num = int(parts[0].split()[1])
-                        name = parts[1].split("[")[1].split("]")[0] if "[" in parts[1] else parts[1].strip()
-                        devices["capture"].append(AudioDevice(
-                            name=name,
-                            card_index=card_num,
-                            device_type="capture"
-                        ))
-                    except Exception:
-                        pass
+        for match in _CARD_RE.finditer(stdout)
+    ]
+
+
+def _mixer_candidates(volume_type: str) -> List[Tuple[Optional[str], str]]:
+    """(card, control) combinations to try for a volume type, in priority order."""
+    # Use appropriate card based on volume type
+    # Speaker: Device (GeneralPlus USB Audio)
+    # Microphone: InnomakerU20CAM (camera with mic)
+    if volume_type == "speaker":
+        cards_to_try = ["Device", None]
+        controls = ["Speaker", "Master", "PCM", "Headphone"]
+    else:  # microphone
+        cards_to_try = ["InnomakerU20CAM", "Device", None]
+        controls = ["Mic", "Capture", "ADC", "ADC PCM"]
+
+    return [(card, control) for card in cards_to_try for control in controls]
+
+
+def _amixer_cmd(card: Optional[str], *args: str) -> List[str]:
+    """Build an amixer command line, optionally targeting a specific card."""
+    cmd = ["amixer"]
+    if card:
+        cmd.extend(["-c", card])
+    cmd.extend(args)
+    return cmd
+
+
+async def _probe_mixers(volume_type: str) -> List[Tuple[Tuple[Optional[str], str], bytes]]:
+    """
+    Query every candidate mixer control concurrently with `amixer sget`.
+
+    Returns [((card, control), stdout), ...] for the controls that exist,
+    in priority order. Wall time is that of the slowest single amixer call.
+    """
+    candidates = _mixer_candidates(volume_type)
+    results = await asyncio.gather(
+        *[_run_command(_amixer_cmd(card, "sget", control), timeout=2)
+          for card, control in candidates],
+        return_exceptions=True,
+    )
+    return [
+        (mixer, result[1])
+        for mixer, result in zip(candidates, results)
+        if not isinstance(result, BaseException) and result[0] == 0
+    ]
+
+
+def _get_alsa_mixer(mixer: Tuple[Optional[str], str]):
+    """Get (or open) the cached alsaaudio.Mixer for a (card, control) pair."""
+    handle = _alsa_mixers.get(mixer)
+    if handle is None:
+        card, control = mixer
+        handle = alsaaudio.Mixer(control, device=f"hw:{card}" if card else "default")
+        _alsa_mixers[mixer] = handle
+    return handle
+
+
+def _alsa_pcmtype(handle, volume_type: str) -> int:
+    """Pick playback or capture volume, preferring capture for microphones."""
+    caps = handle.volumecap()
+    has_capture = any("Capture" in cap for cap in caps)
+    has_playback = any("Capture" not in cap for cap in caps)
+    if has_capture and (volume_type != "speaker" or not has_playback):
+        return alsaaudio.PCM_CAPTURE
+    return alsaaudio.PCM_PLAYBACK
+
+
+def _alsa_set_volume(mixer: Tuple[Optional[str], str], volume_type: str, volume_percent: int) -> bool:
+    """Set volume in-process via alsaaudio. Drops the cached handle on error."""
+    try:
+        handle = _get_alsa_mixer(mixer)
+        handle.setvolume(volume_percent, pcmtype=_alsa_pcmtype(handle, volume_type))
+        return True
+    except Exception:
+        _alsa_mixers.pop(mixer, None)
+        return False
 
-    except Exception as e:
-        logger.error(f"Error getting audio devices: {e}")
 
-    return devices
+def _alsa_get_volume(mixer: Tuple[Optional[str], str], volume_type: str) -> Optional[int]:
+    """Get volume in-process via alsaaudio. Drops the cached handle on error."""
+    try:
+        handle = _get_alsa_mixer(mixer)
+        if hasattr(handle, "handleevents"):
+            handle.handleevents()  # Pick up changes made by other processes
+        return int(handle.getvolume(pcmtype=_alsa_pcmtype(handle, volume_type))[0])
+    except Exception:
+        _alsa_mixers.pop(mixer, None)
+        return None
 
 
-def set_volume(volume_type: str, volume_percent: int) -> bool:
+async def set_volume(volume_type: str, volume_percent: int) -> bool:
     """
-    Set volume using amixer.
+    Set volume using alsaaudio, falling back to amixer.
 
     Args:
         volume_type: "speaker" or "microphone"
@@ -124,127 +298,172 @@ def set_volume(volume_type: str, volume_percent: int) -> bool:
     """
     volume_percent = max(0, min(100, volume_percent))
 
-    # Use appropriate card based on volume type
-    # Speaker: Device (GeneralPlus USB Audio)
-    # Microphone: InnomakerU20CAM (camera with mic)
-    if volume_type == "speaker":
-        cards_to_try = ["Device", None]
-        controls = ["Speaker", "Master", "PCM", "Headphone"]
-    else:  # microphone
-        cards_to_try = ["InnomakerU20CAM", "Device", None]
-        controls = ["Mic", "Capture", "ADC", "ADC PCM"]
+    # Fast path: reuse the control that worked last time
+    mixer = _working_mixer.get(volume_type)
+    if mixer is not None:
+        if await _set_mixer(mixer, volume_type, volume_percent):
+            return True
+        _working_mixer[volume_type] = None
 
-    # Try each card/control combination until one works
-    for card in cards_to_try:
-        for control in controls:
-            try:
-                cmd = ["amixer"]
-                if card:
-                    cmd.extend(["-c", card])
-                cmd.extend(["sset", control, f"{volume_percent}%"])
-
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    timeout=2  # Reduced timeout for faster response
-                )
-                if result.returncode == 0:
-                    return True  # Exit immediately on success
-            except Exception:
-                pass
+    # Probe read-only in parallel, then set only the highest-priority control
+    for mixer, _ in await _probe_mixers(volume_type):
+        if await _set_mixer(mixer, volume_type, volume_percent):
+            _working_mixer[volume_type] = mixer
+            return True  # Exit immediately on success
 
     return False
 
 
-def get_current_volume(volume_type: str) -> Optional[int]:
-    """Get current volume level."""
-    import re
+async def _set_mixer(mixer: Tuple[Optional[str], str], volume_type: str, volume_percent: int) -> bool:
+    """Set a single (card, control) mixer to volume_percent."""
+    if ALSAAUDIO_AVAILABLE and _alsa_set_volume(mixer, volume_type, volume_percent):
+        return True
 
-    # Use appropriate card based on volume type
-    if volume_type == "speaker":
-        cards_to_try = ["Device", None]
-        controls = ["Speaker", "Master", "PCM"]
-    else:  # microphone
-        cards_to_try = ["InnomakerU20CAM", "Device", None]
-        controls = ["Mic", "Capture", "ADC"]
+    card, control = mixer
+    try:
+        returncode, _ = await _run_command(
+            _amixer_cmd(card, "sset", control, f"{volume_percent}%"),
+            timeout=2,  # Reduced timeout for faster response
+            capture_output=False,  # Only the return code is checked
+        )
+        return returncode == 0
+    except Exception:
+        return False
 
-    for card in cards_to_try:
-        for control in controls:
-            try:
-                cmd = ["amixer"]
-                if card:
-                    cmd.extend(["-c", card])
-                cmd.extend(["sget", control])
-
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0:
-                    # Parse output for percentage
-                    for line in result.stdout.splitlines():
-                        if "%" in line:
-                            match = re.search(r'\[(\d+)%\]', line)
-                            if match:
-                                return int(match.group(1))
-            except Exception:
-                pass
+
+async def get_current_volume(volume_type: str) -> Optional[int]:
+    """Get current volume level."""
+    # Fast path: read the control that worked last time
+    mixer = _working_mixer.get(volume_type)
+    if mixer is not None:
+        if ALSAAUDIO_AVAILABLE:
+            volume = _alsa_get_volume(mixer, volume_type)
+            if volume is not None:
+                return volume
+
+        card, control = mixer
+        try:
+            returncode, stdout = await _run_command(_amixer_cmd(card, "sget", control), timeout=2)
+            if returncode == 0:
+                volume = _parse_volume(stdout)
+                if volume is not None:
+                    return volume
+        except Exception:
+            pass
+        _working_mixer[volume_type] = None
+
+    for mixer, stdout in await _probe_mixers(volume_type):
+        volume = _parse_volume(stdout)
+        if volume is not None:
+            _working_mixer[volume_type] = mixer
+            return volume
 
     return None
 
 
+def _parse_volume(stdout: bytes) -> Optional[int]:
+    """Parse the volume percentage from `amixer sget` output."""
+    match = _PCT_RE.search(stdout)
+    return int(match.group(1)) if match else None
+
+
+def _find_test_sound() -> Optional[str]:
+    """Return the first test sound file that exists, or None."""
+    return next((path for path in TEST_SOUND_CANDIDATES if os.path.exists(path)), None)
+
+
+# Resolved once at import (static asset); see play_test_sound
+_TEST_SOUND_PATH: Optional[str] = _find_test_sound()
+
+
+def _load_test_sound(path: str) -> Tuple[Any, int]:
+    """Decode a WAV file into an int16 (frames, channels) array, cached per path."""
+    global _test_sound_cache
+
+    if _test_sound_cache is None or _test_sound_cache[0] != path:
+        with wave.open(path, "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError(f"Unsupported sample width: {wf.getsampwidth()}")
+            channels = wf.getnchannels()
+            frames = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            _test_sound_cache = (path, frames.reshape(-1, channels), wf.getframerate())
+
+    return _test_sound_cache[1], _test_sound_cache[2]
+
+
+def _write_test_sound(frames, samplerate: int) -> bool:
+    """Write the test sound to the shared output stream, stopping early if asked."""
+    chunk = samplerate // 10  # Check for stop every 100ms
+
+    _speaker_test_playing.set()
+    try:
+        with _playback_stream_lock:
+            try:
+                stream = _get_playback_stream(samplerate, frames.shape[1])
+                for start in range(0, len(frames), chunk):
+                    if _speaker_test_stop.is_set():
+                        stream.abort()  # Drop buffered audio immediately
+                        break
+                    stream.write(frames[start:start + chunk])
+                else:
+                    stream.stop()  # Play out what's buffered, then go idle
+                return True
+            except Exception as e:
+                logger.error(f"Error playing test sound: {e}")
+                _close_playback_stream()
+                return False
+            finally:
+                _schedule_playback_close()
+    finally:
+        _speaker_test_playing.clear()
+
+
 def play_test_sound(blocking: bool = True) -> bool:
     """
     Play speaker test sound.
 
+    The WAV is decoded once and written to the shared output stream, so
+    repeated tests don't pay a fork/exec and device open each time.
+
     Args:
         blocking: If True, wait for sound to finish. If False, return immediately.
 
     Returns:
         True if playback started successfully
     """
-    global _speaker_test_process
-
-    test_sound = Path("/home/administrator/lelamp_v3_runtime/assets/setup/LeLamp-SpeakerTest.wav")
-
-    if not test_sound.exists():
-        # Fallback to any available test sound
-        alternatives = [
-            Path("/home/administrator/lelamp_v3_runtime/assets/AudioFX/Effects/Scifi-PositiveDigitization.wav"),
-            Path("/home/administrator/lelamp_v3_runtime/assets/Theme/Lelamp/audio/Notify.wav"),
-        ]
-        for alt in alternatives:
-            if alt.exists():
-                test_sound = alt
-                break
+    global _speaker_test_thread, _TEST_SOUND_PATH
 
-    if not test_sound.exists():
+    test_sound = _TEST_SOUND_PATH
+    if test_sound is None:
+        # Not found at startup - re-probe in case it was installed since
+        test_sound = _TEST_SOUND_PATH = _find_test_sound()
+
+    if test_sound is None:
         logger.error("No test sound file found")
         return False
 
+    if not SOUNDDEVICE_AVAILABLE:
+        logger.error("sounddevice not installed")
+        return False
+
     try:
         # Stop any existing playback first
         stop_test_sound()
 
+        frames, samplerate = _load_test_sound(test_sound)
+        _speaker_test_stop.clear()
+
         if blocking:
-            result = subprocess.run(
-                ["aplay", "-D", "lelamp_playback", str(test_sound)],
-                capture_output=True,
-                timeout=15  # Test sound is ~11.5 seconds
-            )
-            return result.returncode == 0
-        else:
-            # Non-blocking: start process and return immediately
-            _speaker_test_process = subprocess.Popen(
-                ["aplay", "-D", "lelamp_playback", str(test_sound)],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-            return True
-    except subprocess.TimeoutExpired:
-        return False
+            return _write_test_sound(frames, samplerate)
+
+        # Non-blocking: write from a background thread and return immediately
+        _speaker_test_thread = threading.Thread(
+            target=_write_test_sound,
+            args=(frames, samplerate),
+            daemon=True,
+        )
+        _speaker_test_thread.start()
+        return True
     except Exception as e:
         logger.error(f"Error playing test sound: {e}")
         return False
@@ -252,35 +471,91 @@ def play_test_sound(blocking: bool = True) -> bool:
 
 def stop_test_sound() -> bool:
     """Stop any currently playing test sound."""
-    global _speaker_test_process
+    global _speaker_test_thread
 
-    if _speaker_test_process is not None:
-        try:
-            _speaker_test_process.terminate()
-            _speaker_test_process.wait(timeout=1)
-        except Exception:
-            try:
-                _speaker_test_process.kill()
-            except Exception:
-                pass
-        _speaker_test_process = None
+    if _speaker_test_thread is not None:
+        _speaker_test_stop.set()
+        _speaker_test_thread.join(timeout=1)
+        _speaker_test_thread = None
     return True
 
 
 def is_test_sound_playing() -> bool:
-    """Check if test sound is currently playing."""
-    global _speaker_test_process
+    """Check if test sound is currently playing (a flag read, no syscalls)."""
+    return _speaker_test_playing.is_set()
 
-    if _speaker_test_process is None:
-        return False
 
-    # Check if process is still running
-    poll_result = _speaker_test_process.poll()
-    if poll_result is not None:
-        # Process has finished
-        _speaker_test_process = None
+def acquire_level_stream(holder: str) -> bool:
+    """
+    Keep the persistent mic level stream open on behalf of `holder`.
+
+    The stream is opened by the first holder and closed when the last
+    holder releases it. Acquiring twice with the same holder is a no-op.
+    """
+    global _level_stream
+
+    if not SOUNDDEVICE_AVAILABLE:
+        logger.error("sounddevice not installed")
         return False
-    return True
+
+    with _level_stream_lock:
+        if _level_stream is None:
+            try:
+                def callback(indata, frames, time_info, status):
+                    _level_blocks.append(indata[:, 0].copy())
+
+                _level_blocks.clear()
+                _level_stream = sd.InputStream(
+                    samplerate=MIC_LEVEL_SAMPLE_RATE,
+                    channels=1,
+                    dtype='int16',
+                    blocksize=MIC_LEVEL_BLOCKSIZE,
+                    callback=callback,
+                )
+                _level_stream.start()
+            except Exception as e:
+                logger.error(f"Error starting mic level stream: {e}")
+                _level_stream = None
+                return False
+
+        _level_stream_holders.add(holder)
+        return True
+
+
+def release_level_stream(holder: str) -> None:
+    """Release `holder`'s claim on the mic level stream, closing it if unused."""
+    global _level_stream
+
+    with _level_stream_lock:
+        _level_stream_holders.discard(holder)
+        if _level_stream_holders or _level_stream is None:
+            return
+
+        try:
+            _level_stream.stop()
+            _level_stream.close()
+        except Exception as e:
+            logger.debug(f"Error closing mic level stream: {e}")
+        _level_stream = None
+        _level_blocks.clear()
+
+
+def _rms_level(samples) -> int:
+    """Mic level (0-100) from the RMS of int16 samples."""
+    # Sum of squares with an int64 accumulator (no float copy, no int16 overflow)
+    sq_sum = int(np.einsum('i,i->', samples, samples, dtype=np.int64))
+
+    # RMS normalized to 0-100 (int16 max is 32767)
+    # Use a lower reference (10000) for more sensitivity
+    return min(100, int(math.sqrt(sq_sum / samples.size) * _MIC_LEVEL_SCALE))
+
+
+def read_buffered_level() -> Optional[int]:
+    """Mic level over the last ~50ms of the persistent stream, or None if it isn't running."""
+    blocks = list(_level_blocks)
+    if not blocks:
+        return None
+    return _rms_level(np.concatenate(blocks))
 
 
 def start_mic_monitoring() -> bool:
@@ -294,19 +569,20 @@ def start_mic_monitoring() -> bool:
     if _monitoring_active:
         return True  # Already running
 
+    if not SOUNDDEVICE_AVAILABLE:
+        logger.error("sounddevice not installed")
+        return False
+
     _monitoring_stop_event.clear()
 
     def monitor_thread():
         global _monitoring_active
         try:
-            import sounddevice as sd
-            import numpy as np
-
             def callback(indata, outdata, frames, time, status):
                 if status:
                     logger.debug(f"Audio status: {status}")
-                # Direct passthrough with slight gain
-                outdata[:] = indata * 1.0
+                # Direct passthrough, copied into PortAudio's buffer without allocating
+                np.copyto(outdata, indata)
 
             _monitoring_active = True
             logger.info("Starting mic monitoring")
@@ -322,8 +598,6 @@ def start_mic_monitoring() -> bool:
                 while not _monitoring_stop_event.is_set():
                     _monitoring_stop_event.wait(0.1)
 
-        except ImportError:
-            logger.error("sounddevice not installed")
         except Exception as e:
             logger.error(f"Error in mic monitoring: {e}")
         finally:
@@ -334,9 +608,11 @@ def start_mic_monitoring() -> bool:
     _monitoring_thread.start()
 
     # Wait a moment for thread to start
-    import time
     time.sleep(0.2)
 
+    if _monitoring_active:
+        acquire_level_stream("monitoring")
+
     return _monitoring_active
 
 
@@ -344,6 +620,8 @@ def stop_mic_monitoring() -> bool:
     """Stop live microphone monitoring."""
     global _monitoring_active, _monitoring_thread, _monitoring_stop_event
 
+    release_level_stream("monitoring")
+
     if not _monitoring_active:
         return True  # Already stopped
 
@@ -357,6 +635,68 @@ def stop_mic_monitoring() -> bool:
     return True
 
 
+def _get_playback_stream(samplerate: int, channels: int):
+    """Get the shared output stream, reopening it if the format changed."""
+    global _playback_stream
+
+    stream = _playback_stream
+    if stream is not None and (
+        stream.closed or stream.samplerate != samplerate or stream.channels != channels
+    ):
+        _close_playback_stream()
+        stream = None
+
+    if stream is None:
+        stream = sd.OutputStream(samplerate=samplerate, channels=channels, dtype='int16')
+        _playback_stream = stream
+
+    if not stream.active:
+        stream.start()
+    return stream
+
+
+def _close_playback_stream() -> None:
+    """Close the shared output stream (it is reopened on next use)."""
+    global _playback_stream
+
+    if _playback_stream is not None:
+        try:
+            _playback_stream.close()
+        except Exception:
+            pass
+        _playback_stream = None
+
+
+def _schedule_playback_close() -> None:
+    """(Re)start the idle timer that closes the output stream. Call with _playback_stream_lock held."""
+    global _playback_close_timer
+
+    if _playback_close_timer is not None:
+        _playback_close_timer.cancel()
+    _playback_close_timer = threading.Timer(PLAYBACK_IDLE_CLOSE, _close_idle_playback_stream)
+    _playback_close_timer.daemon = True
+    _playback_close_timer.start()
+
+
+def _close_idle_playback_stream() -> None:
+    """Idle timer callback: release the output device unless it's playing again."""
+    with _playback_stream_lock:
+        if _playback_stream is not None and not _playback_stream.active:
+            _close_playback_stream()
+
+
+def close_playback_stream() -> None:
+    """Stop any test playback and close the output stream (called on app shutdown)."""
+    global _playback_close_timer
+
+    stop_test_sound()
+    with _playback_stream_lock:
+        if _playback_close_timer is not None:
+            _playback_close_timer.cancel()
+            _playback_close_timer = None
+        _close_playback_stream()
+
+
 def record_and_playback(duration: float = 3.0) -> bool:
     """
     Record from microphone and play back through speakers.
@@ -367,10 +707,11 @@ def record_and_playback(duration: float = 3.0) -> bool:
     Returns:
         True if successful
     """
-    try:
-        import sounddevice as sd
-        import numpy as np
+    if not SOUNDDEVICE_AVAILABLE:
+        logger.error("sounddevice not installed")
+        return False
 
+    try:
         sample_rate = 24000  # Standardized sample rate
 
         # Record
@@ -383,18 +724,24 @@ def record_and_playback(duration: float = 3.0) -> bool:
         )
         sd.wait()
 
-        # Play back
+        # Play back through the reused output stream. A speaker test still
+        # playing is cut short rather than waited out.
         logger.info("Playing back recording...")
-        sd.play(recording, samplerate=sample_rate)
-        sd.wait()
+        _speaker_test_stop.set()
+        with _playback_stream_lock:
+            try:
+                stream = _get_playback_stream(sample_rate, 1)
+                stream.write(recording)
+                stream.stop()  # Play out what's buffered, then go idle
+            finally:
+                _schedule_playback_close()
 
         return True
 
-    except ImportError:
-        logger.error("sounddevice not installed")
-        return False
     except Exception as e:
         logger.error(f"Error in record/playback: {e}")
+        with _playback_stream_lock:
+            _close_playback_stream()
         return False
 
 
@@ -403,14 +750,15 @@ def record_and_playback(duration: float = 3.0) -> bool:
 # =============================================================================
 
 @router.get("/status")
-async def get_audio_status():
+async def get_audio_status(request: Request):
     """
     Check audio hardware availability.
 
     Returns whether audio hardware is available and ready for setup.
+    Supports ETag revalidation (304 when unchanged).
     """
     try:
-        devices = get_audio_devices()
+        devices = await get_audio_devices()
 
         has_playback = len(devices["playback"]) > 0
         has_capture = len(devices["capture"]) > 0
@@ -419,7 +767,7 @@ async def get_audio_status():
         usb_playback = [d for d in devices["playback"]
                        if "hdmi" not in d.name.lower()]
 
-        return {
+        return etag_response(request, {
             "success": True,
             "available": has_playback and has_capture,
             "has_speaker": has_playback,
@@ -427,7 +775,7 @@ async def get_audio_status():
             "has_usb_audio": len(usb_playback) > 0,
             "playback_count": len(devices["playback"]),
             "capture_count": len(devices["capture"]),
-        }
+        })
 
     except Exception as e:
         logger.error(f"Error checking audio status: {e}")
@@ -439,15 +787,15 @@ async def get_audio_status():
 
 
 @router.get("/devices")
-async def get_audio_devices_endpoint():
-    """Get list of available audio devices."""
+async def get_audio_devices_endpoint(request: Request):
+    """Get list of available audio devices (supports ETag revalidation)."""
     try:
-        devices = get_audio_devices()
-        return {
+        devices = await get_audio_devices()
+        return etag_response(request, {
             "success": True,
             "playback": [d.model_dump() for d in devices["playback"]],
             "capture": [d.model_dump() for d in devices["capture"]],
-        }
+        })
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -555,33 +903,22 @@ async def get_mic_level():
 
     Returns level as percentage (0-100) based on RMS of a short sample.
     """
-    try:
-        import sounddevice as sd
-        import numpy as np
-
-        # Record a very short sample (50ms)
-        sample_rate = 24000  # Standardized sample rate
-        duration = 0.05  # 50ms
-        samples = int(sample_rate * duration)
-
-        recording = sd.rec(samples, samplerate=sample_rate, channels=1, dtype='int16')
-        sd.wait()
-
-        # Calculate RMS level
-        audio_data = recording.flatten().astype(np.float32)
-        rms = np.sqrt(np.mean(audio_data ** 2))
+    if not SOUNDDEVICE_AVAILABLE:
+        return {"success": False, "level": 0, "error": "sounddevice not installed"}
 
-        # Normalize to 0-100 (int16 max is 32767)
-        # Use a lower reference for more sensitivity
-        level = min(100, int((rms / 10000) * 100))
+    try:
+        level = read_buffered_level()
+        if level is None:
+            # No persistent stream - record a very short sample (50ms)
+            recording = sd.rec(MIC_LEVEL_SAMPLES, samplerate=MIC_LEVEL_SAMPLE_RATE, channels=1, dtype='int16')
+            sd.wait()
+            level = _rms_level(recording.ravel())
 
         return {
             "success": True,
             "level": level
         }
 
-    except ImportError:
-        return {"success": False, "level": 0, "error": "sounddevice not installed"}
     except Exception as e:
         logger.error(f"Error getting mic level: {e}")
         return {"success": False, "level": 0, "error": str(e)}
@@ -594,8 +931,10 @@ async def get_volumes():
         config = load_config()
 
         # Try to get live values, fall back to config
-        speaker_vol = get_current_volume("speaker")
-        mic_vol = get_current_volume("microphone")
+        speaker_vol, mic_vol = await asyncio.gather(
+            get_current_volume("speaker"),
+            get_current_volume("microphone"),
+        )
 
         return {
             "success": True,
@@ -616,22 +955,22 @@ async def set_volumes(request: VolumeRequest):
     Updates both the system volume (via amixer) and config file.
     """
     try:
-        config = load_config()
+        patch = {}
         results = {}
 
         if request.speaker_volume is not None:
             vol = max(0, min(100, request.speaker_volume))
-            success = set_volume("speaker", vol)
-            config["volume"] = vol
+            success = await set_volume("speaker", vol)
+            patch["volume"] = vol
             results["speaker"] = {"success": success, "volume": vol}
 
         if request.microphone_volume is not None:
             vol = max(0, min(100, request.microphone_volume))
-            success = set_volume("microphone", vol)
-            config["microphone_volume"] = vol
+            success = await set_volume("microphone", vol)
+            patch["microphone_volume"] = vol
             results["microphone"] = {"success": success, "volume": vol}
 
-        save_config(config)
+        await asyncio.to_thread(update_config, patch)
 
         return {
             "success": True,
@@ -649,11 +988,7 @@ async def skip_audio_setup():
     Marks the step as complete without testing.
     """
     try:
-        config = load_config()
-        config.setdefault("setup", {})
-        config["setup"].setdefault("steps_completed", {})
-        config["setup"]["steps_completed"]["audio"] = True
-        save_config(config)
+        await asyncio.to_thread(update_config, {"setup": {"steps_completed": {"audio": True}}})
 
         return {
             "success": True,
@@ -671,13 +1006,10 @@ async def complete_audio_setup():
     Called after successful speaker and mic tests.
     """
     try:
-        config = load_config()
-        config.setdefault("setup", {})
-        config["setup"].setdefault("steps_completed", {})
-        config["setup"]["steps_completed"]["audio"] = True
-        config["setup"].setdefault("audio", {})
-        config["setup"]["audio"]["tested"] = True
-        save_config(config)
+        await asyncio.to_thread(update_config, {"setup": {
+            "steps_completed": {"audio": True},
+            "audio": {"tested": True},
+        }})
 
         return {
             "success": True,
@@ -699,9 +1031,11 @@ MIC_PRESETS = {
 }
 
 # Calibration state
+CALIBRATION_WINDOW = 20  # Most recent samples used for decisions
+CONFIG_FLUSH_INTERVAL = 5.0  # seconds between debounced config writes
 _calibration_active = False
 _calibration_data = {
-    "samples": [],
+    "samples": deque(maxlen=CALIBRATION_WINDOW),
     "adjustments": 0,
     "current_volume": 50,
     "status": "idle",
@@ -709,14 +1043,60 @@ _calibration_data = {
 }
 
 
+# Server-side calibration loop: samples the persistent mic stream and pushes
+# each decision to subscribers of the /calibration/ws WebSocket
+CALIBRATION_INTERVAL = 0.1  # seconds between samples
+_calibration_task: Optional[asyncio.Task] = None
+_calibration_result: Dict[str, Any] = {}
+_calibration_subscribers: set = set()
+
+# Config changes made during calibration, written in one batch by
+# _flush_calibration_config instead of a load+save per adjustment
+_pending_config_writes: Dict[str, Any] = {}
+_last_flush_ts = 0.0
+_config_flush_task: Optional[asyncio.Task] = None  # Deferred flush, if scheduled
+
+
+async def _flush_calibration_config() -> None:
+    """Write pending calibration config changes to disk in one update."""
+    global _last_flush_ts
+
+    _last_flush_ts = time.monotonic()
+    if not _pending_config_writes:
+        return
+
+    patch = dict(_pending_config_writes)
+    _pending_config_writes.clear()
+    await asyncio.to_thread(update_config, patch)
+
+
+def _schedule_calibration_flush() -> None:
+    """
+    Make sure pending writes are flushed within CONFIG_FLUSH_INTERVAL.
+
+    Covers a calibration that is abandoned (client gone, never stopped)
+    right after an adjustment, which would otherwise never be saved.
+    """
+    global _config_flush_task
+
+    if _config_flush_task is None or _config_flush_task.done():
+        _config_flush_task = asyncio.create_task(_flush_calibration_config_later())
+
+
+async def _flush_calibration_config_later() -> None:
+    delay = _last_flush_ts + CONFIG_FLUSH_INTERVAL - time.monotonic()
+    await asyncio.sleep(max(0.0, delay))
+    await _flush_calibration_config()
+
+
 @router.get("/calibration/presets")
-async def get_mic_presets():
-    """Get available microphone calibration presets."""
-    return {
+async def get_mic_presets(request: Request):
+    """Get available microphone calibration presets (supports ETag revalidation)."""
+    return etag_response(request, {
         "success": True,
         "presets": MIC_PRESETS,
         "current": _calibration_data.get("preset", "normal"),
-    }
+    })
 
 
 @router.post("/calibration/start")
@@ -731,8 +1111,11 @@ async def start_mic_calibration(preset: str = "normal"):
     1. Monitor microphone levels
     2. Adjust volume to reach optimal range for the preset
     3. Return when optimal level achieved or max adjustments reached
+
+    Sampling and adjustment run server-side; progress is pushed over the
+    /calibration/ws WebSocket.
     """
-    global _calibration_active, _calibration_data
+    global _calibration_active, _calibration_data, _calibration_task
 
     if _calibration_active:
         return {"success": False, "error": "Calibration already in progress"}
@@ -743,9 +1126,13 @@ async def start_mic_calibration(preset: str = "normal"):
     config = load_config()
     current_vol = config.get("microphone_volume", 50)
 
+    # Keep the mic open; the calibration loop and /mic-level read from it
+    if not acquire_level_stream("calibration"):
+        return {"success": False, "error": "Could not open microphone for calibration"}
+
     _calibration_active = True
     _calibration_data = {
-        "samples": [],
+        "samples": deque(maxlen=CALIBRATION_WINDOW),
         "adjustments": 0,
         "current_volume": current_vol,
         "status": "listening",
@@ -753,6 +1140,8 @@ async def start_mic_calibration(preset: str = "normal"):
         "target_low": MIC_PRESETS[preset]["target_low"],
         "target_high": MIC_PRESETS[preset]["target_high"],
     }
+    _calibration_result.clear()
+    _calibration_task = asyncio.create_task(_calibration_loop())
 
     return {
         "success": True,
@@ -762,31 +1151,82 @@ async def start_mic_calibration(preset: str = "normal"):
     }
 
 
+async def _calibration_loop():
+    """Sample the mic level, adjust volume and publish progress until done."""
+    global _calibration_active, _calibration_task
+
+    try:
+        while _calibration_active:
+            await asyncio.sleep(CALIBRATION_INTERVAL)
+
+            level = read_buffered_level()
+            if level is None:
+                continue
+
+            result = await _process_calibration_sample(level)
+            _calibration_result.clear()
+            _calibration_result.update(result)
+            _publish_calibration(result)
+
+            if result.get("action") == "complete":
+                break
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.error(f"Error in calibration loop: {e}")
+        _publish_calibration({"success": False, "error": str(e)})
+    finally:
+        # /calibration/stop detaches the task before cancelling it and does
+        # its own cleanup (a new calibration may already be running)
+        if _calibration_task is asyncio.current_task():
+            _calibration_active = False
+            _calibration_task = None
+            release_level_stream("calibration")
+
+
+def _publish_calibration(message: Dict[str, Any]) -> None:
+    """Push a calibration update to every WebSocket subscriber, dropping if a client lags."""
+    for queue in _calibration_subscribers:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            pass
+
+
 @router.post("/calibration/sample")
-async def submit_calibration_sample(level: int):
+async def submit_calibration_sample(level: Optional[int] = None):
     """
-    Submit a mic level sample for calibration.
+    Get the latest calibration decision.
 
-    Called by the frontend during calibration to feed level data.
-    Returns adjustment instructions.
+    Kept for compatibility with clients that fed levels over HTTP; sampling
+    now runs server-side, so the submitted level is ignored.
     """
-    global _calibration_active, _calibration_data
-
+    if _calibration_result:
+        return dict(_calibration_result)
     if not _calibration_active:
         return {"success": False, "error": "No calibration in progress"}
+    return {
+        "success": True,
+        "status": _calibration_data["status"],
+        "action": "wait",
+        "volume": _calibration_data["current_volume"],
+    }
+
+
+async def _process_calibration_sample(level: int) -> Dict[str, Any]:
+    """
+    Feed one mic level sample into calibration.
 
+    Returns adjustment instructions.
+    """
     NOISE_FLOOR = 3
     target_low = _calibration_data["target_low"]
     target_high = _calibration_data["target_high"]
 
-    # Only track levels above noise floor
+    # Only track levels above noise floor (deque keeps the last 20)
     if level > NOISE_FLOOR:
         _calibration_data["samples"].append(level)
 
-    # Keep last 20 samples
-    if len(_calibration_data["samples"]) > 20:
-        _calibration_data["samples"].pop(0)
-
     samples = _calibration_data["samples"]
 
     # Need enough samples to make decisions
@@ -799,15 +1239,16 @@ async def submit_calibration_sample(level: int):
             "volume": _calibration_data["current_volume"],
         }
 
-    # Calculate weighted average (recent samples weighted more)
-    weights = [1 + (i / len(samples)) for i in range(len(samples))]
-    weighted_sum = sum(s * w for s, w in zip(samples, weights))
-    total_weight = sum(weights)
-    avg_level = weighted_sum / total_weight
-    peak_level = max(samples)
+    # Calculate weighted average (recent samples weighted more: 1 + i/n)
+    levels = np.fromiter(samples, dtype=np.float64, count=len(samples))
+    n = levels.size
+    weights = 1.0 + np.arange(n) / n
+    avg_level = float(levels @ weights) / (n + (n - 1) / 2)  # sum(weights) in closed form
+    peak_level = int(levels.max())
 
     # Check if we're in optimal range
     if avg_level >= target_low and avg_level <= target_high and peak_level < 95:
+        await _flush_calibration_config()
         _calibration_data["status"] = f"Optimal! Avg: {avg_level:.0f}%, Peak: {peak_level:.0f}%"
         return {
             "success": True,
@@ -842,18 +1283,21 @@ async def submit_calibration_sample(level: int):
 
     if new_volume != _calibration_data["current_volume"]:
         # Apply volume change
-        set_volume("microphone", new_volume)
+        await set_volume("microphone", new_volume)
         _calibration_data["current_volume"] = new_volume
         _calibration_data["adjustments"] += 1
-        _calibration_data["samples"] = []  # Reset after adjustment
+        _calibration_data["samples"].clear()  # Reset after adjustment
 
-        # Update config
-        config = load_config()
-        config["microphone_volume"] = new_volume
-        save_config(config)
+        # Update config (debounced)
+        _pending_config_writes["microphone_volume"] = new_volume
+        if time.monotonic() - _last_flush_ts >= CONFIG_FLUSH_INTERVAL:
+            await _flush_calibration_config()
+        else:
+            _schedule_calibration_flush()
 
     # Check if we've made too many adjustments
     if _calibration_data["adjustments"] > 15:
+        await _flush_calibration_config()
         _calibration_data["status"] = f"Calibration complete at {new_volume}%"
         return {
             "success": True,
@@ -877,12 +1321,18 @@ async def submit_calibration_sample(level: int):
 @router.post("/calibration/stop")
 async def stop_mic_calibration():
     """Stop microphone calibration."""
-    global _calibration_active, _calibration_data
+    global _calibration_active, _calibration_data, _calibration_task
 
     _calibration_active = False
+    if _calibration_task is not None:
+        _calibration_task.cancel()
+        _calibration_task = None
+    release_level_stream("calibration")
+    await _flush_calibration_config()
+    _calibration_result.clear()
     result_volume = _calibration_data.get("current_volume", 50)
     _calibration_data = {
-        "samples": [],
+        "samples": deque(maxlen=CALIBRATION_WINDOW),
         "adjustments": 0,
         "current_volume": result_volume,
         "status": "idle",
@@ -897,39 +1347,231 @@ async def stop_mic_calibration():
 
 
 @router.get("/calibration/status")
-async def get_calibration_status():
-    """Get current calibration status."""
-    return {
+async def get_calibration_status(request: Request):
+    """Get current calibration status (supports ETag revalidation)."""
+    # max_age=0: status changes live during calibration, so always revalidate
+    return etag_response(request, {
         "success": True,
         "active": _calibration_active,
         "status": _calibration_data.get("status", "idle"),
         "volume": _calibration_data.get("current_volume", 50),
         "adjustments": _calibration_data.get("adjustments", 0),
         "preset": _calibration_data.get("preset", "normal"),
-    }
+    }, max_age=0)
+
+
+@router.websocket("/calibration/ws")
+async def calibration_ws(websocket: WebSocket):
+    """
+    WebSocket endpoint for live calibration progress.
+
+    Each message is the decision for one sample (same shape as the
+    /calibration/sample response).
+    """
+    await websocket.accept()
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=10)
+    _calibration_subscribers.add(queue)
+    # Watch the socket too: while no calibration runs nothing is sent, so a
+    # disconnect would otherwise go unnoticed and the handler would wait forever
+    disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        if _calibration_result:
+            await websocket.send_json(dict(_calibration_result))
+        while True:
+            next_update = asyncio.create_task(queue.get())
+            await asyncio.wait(
+                {next_update, disconnected}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnected.done():
+                next_update.cancel()
+                break
+            await websocket.send_json(next_update.result())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        _calibration_subscribers.discard(queue)
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Read (and ignore) client messages until the client disconnects."""
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+    except (WebSocketDisconnect, RuntimeError):
+        return  # Socket already closed
 
 
 # =============================================================================
 # WebSocket for Real-time Audio Waveform
 # =============================================================================
 
+WAVEFORM_SAMPLE_RATE = 24000
+WAVEFORM_BLOCKSIZE = 800  # ~33ms chunks at 24kHz = ~30fps
+WAVEFORM_POINTS = 128  # Samples sent per frame for visualization
+WAVEFORM_STEP = WAVEFORM_BLOCKSIZE // WAVEFORM_POINTS  # Decimation stride
+
+# Binary frame header: rms (u8), peak (u8), sample count (u16), reserved (u16).
+# Followed by the int16 little-endian samples; decode in the browser with
+# `new Int16Array(buf, 6, count)` and divide by 32768 for -1..1.
+_WAVEFORM_HEADER = struct.Struct('<BBHH')
+
+# Frames that queued up while a send was in flight go out together in one
+# message (header + samples, back to back). Capped to keep latency low.
+WAVEFORM_MAX_BATCH = 4
+
+# Keep-alive sent when no audio arrives for this long. Pre-serialized text
+# frame; protocol-level pings are already handled by the ASGI server.
+WAVEFORM_HEARTBEAT_INTERVAL = 5.0
+_WAVEFORM_HEARTBEAT = '{"heartbeat":true}'
+
+
+def _decimate(samples: np.ndarray) -> np.ndarray:
+    """Downsample a block to WAVEFORM_POINTS samples for visualization."""
+    if len(samples) == WAVEFORM_BLOCKSIZE:
+        # Fixed block size: constant stride, no index array needed
+        return samples[::WAVEFORM_STEP][:WAVEFORM_POINTS]
+    if len(samples) > WAVEFORM_POINTS:
+        # Take evenly spaced samples
+        indices = np.linspace(0, len(samples) - 1, WAVEFORM_POINTS, dtype=int)
+        return samples[indices]
+    return samples
+
+
+def _waveform_levels(samples: np.ndarray) -> Tuple[int, int]:
+    """
+    RMS and peak (0-100) of int16 samples.
+
+    Works on the integer data directly: one sum-of-squares with an int64
+    accumulator and a min/max pair, scaled to float once at the end.
+    """
+    if samples.size == 0:
+        return 0, 0
+    sq_sum = int(np.einsum('i,i->', samples, samples, dtype=np.int64))
+    # max(|min|, max) instead of np.abs, which overflows on -32768
+    peak = max(int(samples.max()), -int(samples.min()))
+    return _scale_levels(sq_sum, peak, samples.size)
+
+
+def _scale_levels(sq_sum: int, peak: int, count: int) -> Tuple[int, int]:
+    """Scale an int16 sum-of-squares and peak to 0-100 display levels."""
+    rms = math.sqrt(sq_sum / count) / 32768.0
+    # Scale to 0-100 for display
+    rms_percent = min(100, int(rms * 300))  # Scale up for visibility
+    peak_percent = min(100, peak * 150 // 32768)
+    return rms_percent, peak_percent
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _block_kernel(raw, step, out):
+        """Sum of squares and peak of raw, plus stride-copy into out (one pass each)."""
+        sq_sum = 0
+        peak = 0
+        for i in range(raw.shape[0]):
+            v = np.int64(raw[i])
+            sq_sum += v * v
+            if v < 0:
+                v = -v
+            if v > peak:
+                peak = v
+        n = 0
+        for i in range(0, raw.shape[0], step):
+            if n >= out.shape[0]:
+                break
+            out[n] = raw[i]
+            n += 1
+        return sq_sum, peak, n
+else:
+    _block_kernel = None
+
+
+def _process_block(raw: np.ndarray, out: np.ndarray) -> Tuple[int, int, int]:
+    """
+    Levels and visualization samples for one waveform block.
+
+    The decimated samples are written into the preallocated out buffer
+    (WAVEFORM_POINTS int16). Uses the numba kernel for full-size blocks when
+    available, otherwise plain numpy.
+
+    Returns:
+        (rms_percent, peak_percent, number of samples written to out)
+    """
+    if _block_kernel is not None and len(raw) == WAVEFORM_BLOCKSIZE:
+        sq_sum, peak, n = _block_kernel(raw, WAVEFORM_STEP, out)
+        rms_percent, peak_percent = _scale_levels(sq_sum, peak, len(raw))
+        return rms_percent, peak_percent, n
+
+    # Levels over the full block (more accurate than the decimated points)
+    rms_percent, peak_percent = _waveform_levels(raw)
+    # Downsample to ~128 points for visualization
+    samples = _decimate(raw)
+    n = len(samples)
+    np.copyto(out[:n], samples)
+    return rms_percent, peak_percent, n
+
+
+def _warm_block_kernel() -> None:
+    """Compile (or load from cache) the numba kernel before audio starts."""
+    if _block_kernel is not None:
+        # Same array layouts as the callback: a column of the (frames, 1)
+        # input block, and an int16 view into a bytearray
+        raw = np.zeros((WAVEFORM_BLOCKSIZE, 1), dtype=np.int16)[:, 0]
+        out = np.frombuffer(bytearray(2 * WAVEFORM_POINTS), dtype='<i2')
+        _block_kernel(raw, WAVEFORM_STEP, out)
+
+
 @router.websocket("/waveform")
 async def audio_waveform_ws(websocket: WebSocket):
     """
     WebSocket endpoint for real-time microphone waveform visualization.
 
     Streams audio samples at ~30fps for smooth waveform rendering.
-    Each message contains:
-    - samples: array of normalized audio samples (-1 to 1)
-    - rms: current RMS level (0-100)
-    - peak: peak level in this chunk (0-100)
+
+    Wire format (binary; replaces the earlier JSON
+    {"samples": [...], "rms": n, "peak": n} messages):
+
+    Each binary message holds 1 to WAVEFORM_MAX_BATCH frames back to back.
+    A frame is a 6-byte little-endian header (struct '<BBHH'):
+    - byte 0, u8: rms, current RMS level (0-100)
+    - byte 1, u8: peak, peak level in this chunk (0-100)
+    - bytes 2-3, u16: count, number of samples that follow (<= WAVEFORM_POINTS)
+    - bytes 4-5, u16: reserved, always 0
+
+    followed by count int16 little-endian samples (divide by 32768 for -1
+    to 1). The next frame, if any, starts at offset 6 + 2 * count. In the
+    browser (binaryType = 'arraybuffer'):
+
+        const view = new DataView(buf, offset)
+        const count = view.getUint16(2, true)
+        const samples = new Int16Array(buf, offset + 6, count)
+
+    Text messages are JSON: {"heartbeat": true} after
+    WAVEFORM_HEARTBEAT_INTERVAL seconds without audio, and {"error": "..."}
+    before the server closes on failure.
     """
     await websocket.accept()
     logger.info("Audio waveform WebSocket connected")
 
     stream = None
     stop_event = threading.Event()
-    audio_queue = asyncio.Queue(maxsize=10)
+    loop = asyncio.get_running_loop()
+    # Single producer (audio thread) / single consumer (this loop). maxlen
+    # drops the oldest frames if the client falls behind.
+    frames = deque(maxlen=10)
+    frame_ready = asyncio.Event()
+    # Scratch frame reused by every callback: header + samples, written in place
+    frame_buf = bytearray(_WAVEFORM_HEADER.size + 2 * WAVEFORM_POINTS)
+    frame_samples = np.frombuffer(frame_buf, dtype='<i2', offset=_WAVEFORM_HEADER.size)
+    frame_view = memoryview(frame_buf)
+
+    def push_frame(frame: bytes):
+        """Runs on the event loop (scheduled from the audio thread)."""
+        frames.append(frame)
+        frame_ready.set()
 
     def audio_callback(indata, frames, time_info, status):
         """Sounddevice callback - runs in separate thread."""
@@ -939,50 +1581,29 @@ async def audio_waveform_ws(websocket: WebSocket):
             return
 
         try:
-            import numpy as np
-            # Convert to float and normalize
-            samples = indata[:, 0].astype(np.float32)
+            rms_percent, peak_percent, n = _process_block(indata[:, 0], frame_samples)
+            _WAVEFORM_HEADER.pack_into(frame_buf, 0, rms_percent, peak_percent, n, 0)
+            # One copy out of the scratch buffer (the frame outlives this call)
+            frame = bytes(frame_view[:_WAVEFORM_HEADER.size + 2 * n])
 
-            # Downsample to ~128 points for visualization
-            if len(samples) > 128:
-                # Take evenly spaced samples
-                indices = np.linspace(0, len(samples) - 1, 128, dtype=int)
-                samples = samples[indices]
-
-            # Normalize to -1 to 1 range
-            samples = samples / 32768.0
-
-            # Calculate RMS and peak
-            rms = np.sqrt(np.mean(samples ** 2))
-            peak = np.max(np.abs(samples))
-
-            # Scale to 0-100 for display
-            rms_percent = min(100, int(rms * 300))  # Scale up for visibility
-            peak_percent = min(100, int(peak * 150))
-
-            # Put in queue (non-blocking)
-            try:
-                audio_queue.put_nowait({
-                    "samples": samples.tolist(),
-                    "rms": rms_percent,
-                    "peak": peak_percent,
-                })
-            except asyncio.QueueFull:
-                pass  # Drop frame if queue is full
+            loop.call_soon_threadsafe(push_frame, frame)
 
         except Exception as e:
             logger.error(f"Error in audio callback: {e}")
 
     try:
-        import sounddevice as sd
-        import numpy as np
+        if not SOUNDDEVICE_AVAILABLE:
+            raise ImportError("sounddevice not available")
+
+        # JIT compile off the event loop so the first callback isn't slow
+        await asyncio.to_thread(_warm_block_kernel)
 
         # Start audio stream
         stream = sd.InputStream(
-            samplerate=24000,  # Standardized sample rate
+            samplerate=WAVEFORM_SAMPLE_RATE,  # Standardized sample rate
             channels=1,
             dtype='int16',
-            blocksize=800,  # ~33ms chunks at 24kHz = ~30fps
+            blocksize=WAVEFORM_BLOCKSIZE,
             callback=audio_callback,
         )
         stream.start()
@@ -992,19 +1613,27 @@ async def audio_waveform_ws(websocket: WebSocket):
         while True:
             try:
                 # Wait for audio data with timeout
-                data = await asyncio.wait_for(audio_queue.get(), timeout=0.1)
-                try:
-                    await websocket.send_json(data)
-                except WebSocketDisconnect:
-                    logger.debug("WebSocket disconnected during send")
-                    break
+                await asyncio.wait_for(frame_ready.wait(), timeout=WAVEFORM_HEARTBEAT_INTERVAL)
             except asyncio.TimeoutError:
                 # Send heartbeat to keep connection alive
                 try:
-                    await websocket.send_json({"heartbeat": True})
+                    await websocket.send_text(_WAVEFORM_HEARTBEAT)
                 except WebSocketDisconnect:
                     logger.debug("WebSocket disconnected during heartbeat")
                     break
+                continue
+
+            frame_ready.clear()
+            try:
+                while frames:
+                    # Coalesce any backlog into as few messages as possible
+                    batch = [frames.popleft()]
+                    while frames and len(batch) < WAVEFORM_MAX_BATCH:
+                        batch.append(frames.popleft())
+                    await websocket.send_bytes(batch[0] if len(batch) == 1 else b"".join(batch))
+            except WebSocketDisconnect:
+                logger.debug("WebSocket disconnected during send")
+                break
 
     except ImportError as e:
         logger.error(f"sounddevice not installed: {e}")
@@ -1033,7 +1662,7 @@ async def audio_waveform_ws(websocket: WebSocket):
 # Microphone Service Status (Runtime VAD/AEC)
 # =============================================================================
 
-@router.get("/microphone-service/status")
+@router.get("/microphone-service/status", response_class=FastJSONResponse)
 async def get_microphone_service_status():
     """
     Get status of the microphone service (VAD, gating, echo cancellation).
@@ -1075,7 +1704,7 @@ async def get_microphone_service_status():
         return {"success": False, "error": str(e)}
 
 
-@router.post("/microphone-service/vad-threshold")
+@router.post("/microphone-service/vad-threshold", response_class=FastJSONResponse)
 async def set_microphone_vad_threshold(threshold: float):
     """
     Set VAD (Voice Activity Detection) threshold.
@@ -1099,7 +1728,7 @@ async def set_microphone_vad_threshold(threshold: float):
         return {"success": False, "error": str(e)}
 
 
-@router.post("/microphone-service/gate")
+@router.post("/microphone-service/gate", response_class=FastJSONResponse)
 async def control_microphone_gate(action: str):
     """
     Manually control the microphone gate.
@@ -1133,7 +1762,7 @@ async def control_microphone_gate(action: str):
         return {"success": False, "error": str(e)}
 
 
-@router.post("/microphone-service/barge-in-threshold")
+@router.post("/microphone-service/barge-in-threshold", response_class=FastJSONResponse)
 async def set_barge_in_threshold(threshold: float):
     """
     Set barge-in RMS threshold.
@@ -1157,7 +1786,7 @@ async def set_barge_in_threshold(threshold: float):
         return {"success": False, "error": str(e)}
 
 
-@router.post("/microphone-service/gate-release-time")
+@router.post("/microphone-service/gate-release-time", response_class=FastJSONResponse)
 async def set_gate_release_time(seconds: float):
     """
     Set gate release delay time.
@@ -1189,7 +1818,7 @@ async def set_gate_release_time(seconds: float):
         return {"success": False, "error": str(e)}
 
 
-@router.post("/microphone-service/debug-logging")
+@router.post("/microphone-service/debug-logging", response_class=FastJSONResponse)
 async def set_debug_logging(enabled: bool):
     """
     Enable/disable verbose debug logging for microphone service.
@@ -9,12 +9,13 @@ import logging
 from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import Optional
-from api.deps import load_config, save_config, get_animation_service
+from api.deps import load_config, edit_config, get_animation_service
+from api.responses import FastJSONResponse
 import lelamp.globals as g
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 
 # Global calibration service instance for this module
 _calibration_service = None
@@ -181,22 +182,20 @@ async def finalize_calibration():
     result = _calibration_service.finalize_calibration()
 
     if result["success"]:
-        # Load and update config
-        config = load_config()
-
-        # Enable motors in config
-        if "motors" not in config:
-            config["motors"] = {}
-        config["motors"]["enabled"] = True
-
-        # Mark calibration step as complete
-        if "setup" not in config:
-            config["setup"] = {}
-        if "steps_completed" not in config["setup"]:
-            config["setup"]["steps_completed"] = {}
-        config["setup"]["steps_completed"]["motor_calibration"] = True
-
-        save_config(config)
+        # Update config under the config lock (file I/O off the event loop)
+        def apply(config: dict) -> None:
+            motors = config.setdefault("motors", {})
+            steps_completed = config.setdefault("setup", {}).setdefault("steps_completed", {})
+
+            # Only change something if needed (save_config then skips the
+            # write, e.g. on re-calibration)
+            if motors.get("enabled") is not True or steps_completed.get("motor_calibration") is not True:
+                # Enable motors in config
+                motors["enabled"] = True
+                # Mark calibration step as complete
+                steps_completed["motor_calibration"] = True
+
+        await asyncio.to_thread(edit_config, apply)
 
         # Clear calibration flags
         g.calibration_required = False
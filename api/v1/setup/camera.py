@@ -8,25 +8,71 @@ Provides endpoints for detecting and configuring cameras:
 """
 
 import asyncio
+import fcntl
 import logging
+import os
+import stat
+import struct
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Generator
+from typing import Optional, Dict, Any, List, AsyncGenerator, Tuple
 
 import cv2
-from fastapi import APIRouter, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
-from api.deps import load_config, save_config
+from api.cache import etag_response
+from api.deps import load_config, update_config
+from api.responses import FastJSONResponse
 
-router = APIRouter()
+# Optional libjpeg-turbo (SIMD) JPEG encoder; falls back to cv2.imencode
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    _turbojpeg = TurboJPEG()
+    TURBOJPEG_AVAILABLE = True
+except (ImportError, OSError, RuntimeError):  # RuntimeError: libturbojpeg not found
+    TURBOJPEG_AVAILABLE = False
+    _turbojpeg = None
+
+router = APIRouter(default_response_class=FastJSONResponse)
 logger = logging.getLogger(__name__)
 
-# Preview state
-_preview_cap = None
+# Preview state: open captures shared between preview clients, by device path.
+# Kept open for PREVIEW_IDLE_CLOSE seconds after the last client leaves so
+# reconnects (tab switches, re-renders) skip the USB open/negotiate cost.
+_preview_cap: Dict[str, "_PreviewCapture"] = {}
 _preview_lock = threading.Lock()
+PREVIEW_IDLE_CLOSE = 10.0
+
+# Blocking camera I/O (opens, probes, frame reads) runs here instead of the
+# shared default executor, so a long preview can't starve other endpoints
+_camera_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="camera")
+
+# MJPEG preview frame rate
+PREVIEW_FPS = 15
+
+# Preview/snapshot size when vision.resolution isn't configured
+PREVIEW_RESOLUTION = (640, 480)
+
+# Deep (frame read) probe results: device path -> (monotonic timestamp, working)
+CAMERA_PROBE_TTL = 5.0
+_camera_probe_cache: Dict[str, Tuple[float, bool]] = {}
+
+# Camera list shared by /status and /devices polls
+CAMERAS_CACHE_TTL = 2.0
+_cameras_cache: Dict[str, Any] = {"ts": 0.0, "value": None}
+_cameras_lock = asyncio.Lock()
+
+
+# V4L2 VIDIOC_QUERYCAP: struct v4l2_capability is driver[16], card[32],
+# bus_info[32], then u32 version, capabilities, device_caps, reserved[3]
+_V4L2_CAPABILITY = struct.Struct("16s32s32sIII12x")
+VIDIOC_QUERYCAP = (2 << 30) | (_V4L2_CAPABILITY.size << 16) | (ord("V") << 8) | 0
+V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+V4L2_CAP_DEVICE_CAPS = 0x80000000
 
 
 # =============================================================================
@@ -48,14 +94,34 @@ class EnableRequest(BaseModel):
 # Helper Functions
 # =============================================================================
 
-def get_available_cameras() -> List[Dict[str, Any]]:
-    """
-    Get list of available camera devices.
+async def get_available_cameras() -> List[Dict[str, Any]]:
+    """Get available camera devices (cached for CAMERAS_CACHE_TTL seconds)."""
+    async with _cameras_lock:
+        cached = _cameras_cache["value"]
+        if cached is not None and time.monotonic() - _cameras_cache["ts"] < CAMERAS_CACHE_TTL:
+            return cached
 
-    Checks known symlinks and probes /dev/video* devices.
+        # One worker-thread hop for the whole scan: the per-device checks are
+        # microsecond ioctls, and the default executor keeps it from queueing
+        # behind preview frame reads on the camera executor
+        cameras = await asyncio.to_thread(_enumerate_cameras)
+        _cameras_cache["value"] = cameras
+        _cameras_cache["ts"] = time.monotonic()
+        return cameras
+
+
+def _invalidate_cameras_cache() -> None:
+    """Force the next get_available_cameras() call to re-probe."""
+    _cameras_cache["ts"] = 0.0
+
+
+def _enumerate_cameras() -> List[Dict[str, Any]]:
     """
-    cameras = []
+    Enumerate camera devices (blocking).
 
+    Checks known symlinks and probes /dev/video* devices with a
+    VIDIOC_QUERYCAP ioctl each; no streams are opened.
+    """
     # Known camera symlinks
     known_cameras = [
         {
@@ -85,44 +151,52 @@ def get_available_cameras() -> List[Dict[str, Any]]:
     ]
 
     seen_devices = set()
+    candidates = []  # (camera info, drop if not working)
+
+    # One directory read instead of a stat per candidate path
+    present = _scan_video_entries()
 
     # Check known symlinks
     for cam in known_cameras:
-        path = Path(cam["symlink"])
-        if path.exists():
-            # Resolve to actual device
-            try:
-                actual = str(path.resolve())
-                if actual in seen_devices:
-                    continue
-                seen_devices.add(actual)
-            except Exception:
-                actual = cam["symlink"]
-
-            # Test if it works
-            working = _test_camera(cam["symlink"])
-
-            cameras.append({
-                "path": cam["symlink"],
-                "actual_device": actual,
-                "name": cam["name"],
-                "type": cam["type"],
-                "has_mic": cam["has_mic"],
-                "working": working,
-            })
+        entry = present.get(os.path.basename(cam["symlink"]))
+        if entry is None:
+            continue
+
+        # Resolve to actual device
+        try:
+            actual = _resolve_dev_entry(present, entry)
+            if actual is None:
+                continue  # Dangling symlink
+            if actual in seen_devices:
+                continue
+            seen_devices.add(actual)
+        except OSError:
+            actual = cam["symlink"]
+
+        candidates.append(({
+            "path": cam["symlink"],
+            "actual_device": actual,
+            "name": cam["name"],
+            "type": cam["type"],
+            "has_mic": cam["has_mic"],
+        }, False))
 
     # Probe additional /dev/video* devices
-    for i in range(10):
+    video_indices = sorted(
+        int(name[5:]) for name in present
+        if name.startswith("video") and name[5:].isdigit()
+    )
+    for i in video_indices:
+        if i >= 10:
+            break
         video_path = f"/dev/video{i}"
-        if not Path(video_path).exists():
-            continue
 
         # Skip already-seen devices
         try:
-            actual = str(Path(video_path).resolve())
-            if actual in seen_devices:
+            actual = _resolve_dev_entry(present, present[f"video{i}"])
+            if actual is None or actual in seen_devices:
                 continue
-        except Exception:
+        except OSError:
             actual = video_path
 
         # Get device name from sysfs
@@ -138,26 +212,119 @@ def get_available_cameras() -> List[Dict[str, Any]]:
         if any(x in name.lower() for x in ["pispbe", "rpi-hevc", "bcm2835"]):
             continue
 
-        # Test if it works
-        working = _test_camera(video_path)
-        if not working:
-            continue
-
         seen_devices.add(actual)
-        cameras.append({
+        candidates.append(({
             "path": video_path,
             "actual_device": actual,
             "name": name,
             "type": "generic",
             "has_mic": False,
-            "working": working,
-        })
+        }, True))
+
+    # Test if they work
+    cameras = []
+    for cam, drop_if_broken in candidates:
+        working = _test_camera(cam["path"])
+        if drop_if_broken and not working:
+            continue
+        cam["working"] = working
+        cameras.append(cam)
 
     return cameras
 
 
-def _test_camera(device_path: str) -> bool:
-    """Test if a camera device works by trying to read a frame."""
+def _in_camera_thread(func, *args) -> asyncio.Future:
+    """Run a blocking camera call on the camera executor."""
+    return asyncio.get_running_loop().run_in_executor(_camera_executor, func, *args)
+
+
+def _check_device_path(device: str) -> Optional[str]:
+    """
+    Validate a camera device path with a single stat.
+
+    Returns an error message, or None if device is a character device
+    under /dev (symlinks such as /dev/usbcam are followed).
+    """
+    if not device.startswith("/dev/"):
+        return "Invalid device path"
+    try:
+        st = os.stat(device)
+    except OSError:
+        return f"Device not found: {device}"
+    if not stat.S_ISCHR(st.st_mode):
+        return f"Not a video device: {device}"
+    return None
+
+
+def _scan_video_entries() -> Dict[str, os.DirEntry]:
+    """/dev entries that may be cameras (video* nodes and usbcam* symlinks), by name."""
+    try:
+        with os.scandir("/dev") as entries:
+            return {
+                entry.name: entry for entry in entries
+                if entry.name.startswith(("video", "usbcam"))
+            }
+    except OSError:
+        return {}
+
+
+def _resolve_dev_entry(present: Dict[str, os.DirEntry], entry: os.DirEntry) -> Optional[str]:
+    """Device path an entry points to, or None for a dangling symlink."""
+    if not entry.is_symlink():
+        return entry.path
+    target = os.path.normpath(os.path.join("/dev", os.readlink(entry.path)))
+    name = os.path.basename(target)
+    if os.path.dirname(target) == "/dev" and name in present:
+        # udev links point at siblings (e.g. "video0") the scan already saw
+        return _resolve_dev_entry(present, present[name])
+    return os.path.realpath(target) if os.path.exists(target) else None
+
+
+def _test_camera(device_path: str, deep: bool = False) -> bool:
+    """
+    Test if a camera device works.
+
+    By default this is a VIDIOC_QUERYCAP ioctl, which checks that the device
+    answers and supports video capture without opening a stream. With
+    deep=True it opens the device with OpenCV and reads a frame; those
+    results are cached for CAMERA_PROBE_TTL seconds.
+    """
+    if not deep:
+        return _query_video_capture(device_path)
+
+    cached = _camera_probe_cache.get(device_path)
+    if cached is not None and time.monotonic() - cached[0] < CAMERA_PROBE_TTL:
+        return cached[1]
+
+    working = _probe_camera(device_path)
+    _camera_probe_cache[device_path] = (time.monotonic(), working)
+    return working
+
+
+def _query_video_capture(device_path: str) -> bool:
+    """Check V4L2 capabilities for video capture support."""
+    try:
+        fd = os.open(device_path, os.O_RDWR | os.O_NONBLOCK)
+    except OSError:
+        return False
+
+    try:
+        buf = bytearray(_V4L2_CAPABILITY.size)
+        fcntl.ioctl(fd, VIDIOC_QUERYCAP, buf)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+    _, _, _, _, capabilities, device_caps = _V4L2_CAPABILITY.unpack(buf)
+    # device_caps describes this node; capabilities covers the whole device
+    if capabilities & V4L2_CAP_DEVICE_CAPS:
+        capabilities = device_caps
+    return bool(capabilities & V4L2_CAP_VIDEO_CAPTURE)
+
+
+def _probe_camera(device_path: str) -> bool:
+    """Open the device and read a single frame."""
     try:
         cap = cv2.VideoCapture(device_path)
         if not cap.isOpened():
@@ -171,51 +338,288 @@ def _test_camera(device_path: str) -> bool:
         return False
 
 
-def _generate_mjpeg_frames(device_path: str) -> Generator[bytes, None, None]:
+_JPEG_SOI = b'\xff\xd8'
+
+# multipart/x-mixed-replace part header. The CRLF that ends the previous part
+# belongs to the delimiter (RFC 2046), so it leads here instead of trailing
+# each JPEG. Content-Length lets clients read the part without scanning.
+_MJPEG_PART_HEADER = b'\r\n--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n'
+_MJPG_FOURCC = cv2.VideoWriter_fourcc(*'MJPG')
+
+
+def _request_mjpg_passthrough(cap) -> bool:
     """
-    Generate MJPEG frames for streaming.
+    Ask the camera for MJPG and have OpenCV hand back the compressed frames.
 
-    Yields frames as multipart/x-mixed-replace content.
+    Returns True if the camera negotiated MJPG and decoding was disabled, so
+    cap.read() yields ready-to-send JPEG bytes.
     """
-    cap = None
-    try:
-        cap = cv2.VideoCapture(device_path)
-        if not cap.isOpened():
-            logger.error(f"Failed to open camera at {device_path}")
-            return
+    cap.set(cv2.CAP_PROP_FOURCC, _MJPG_FOURCC)
+    if int(cap.get(cv2.CAP_PROP_FOURCC)) != _MJPG_FOURCC:
+        return False
+    return bool(cap.set(cv2.CAP_PROP_CONVERT_RGB, 0))
 
-        # Set reasonable resolution for preview
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        cap.set(cv2.CAP_PROP_FPS, 15)
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
+def _encode_jpeg(frame, quality: int) -> Optional[bytes]:
+    """Encode a BGR frame as JPEG, preferring libjpeg-turbo when available."""
+    if _turbojpeg is not None:
+        try:
+            # 4:2:0 matches cv2.imencode's default chroma subsampling
+            return _turbojpeg.encode(
+                frame, quality=quality, pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420,
+            )
+        except Exception as e:
+            logger.debug(f"turbojpeg encode failed, using OpenCV: {e}")
+
+    ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buffer.tobytes() if ret else None
+
+
+class _PreviewCapture:
+    """An open camera configured for the MJPEG preview."""
+
+    def __init__(self, device_path: str, resolution: Tuple[int, int]):
+        self.device_path = device_path
+        self.width, self.height = resolution
+        # Serializes read_jpeg and release, which may run on different threads
+        self.lock = threading.Lock()
+        # Managed under _preview_lock
+        self.refs = 0
+        self.last_used = 0.0
+        self.broken = False
+        # Latest preview frame, published by a single reader task for every
+        # streaming client (event-loop side only)
+        self.frame: Optional[bytes] = None
+        self.frame_seq = 0
+        self._frame_event = asyncio.Event()
+        self._reader: Optional[asyncio.Task] = None
+        self.cap = cv2.VideoCapture(device_path)
+        if not self.cap.isOpened():
+            self.cap.release()
+            raise RuntimeError(f"Failed to open camera at {device_path}")
+
+        # Request MJPG before the resolution so V4L2 negotiates them together
+        self.passthrough = _request_mjpg_passthrough(self.cap)
+
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.cap.set(cv2.CAP_PROP_FPS, PREVIEW_FPS)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def read_jpeg(self) -> Optional[bytes]:
+        """Read the next frame as JPEG bytes (blocking). None when the stream ends."""
+        with self.lock:
+            return self._read_jpeg()
+
+    def _read_jpeg(self) -> Optional[bytes]:
         while True:
-            ret, frame = cap.read()
+            ret, frame = self.cap.read()
             if not ret:
-                break
+                return None
+
+            if self.passthrough:
+                frame_bytes = frame.tobytes()
+                if frame_bytes.startswith(_JPEG_SOI):
+                    return frame_bytes
+                # Backend ignored CONVERT_RGB; go back to decoded frames
+                logger.debug(f"MJPG passthrough unavailable for {self.device_path}")
+                self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+                self.passthrough = False
+                continue
+
+            # Driver ignored the requested size: shrink (keeping aspect)
+            # before encoding, JPEG cost scales with pixel count
+            frame_h, frame_w = frame.shape[:2]
+            scale = min(self.width / frame_w, self.height / frame_h)
+            if scale < 1:
+                frame = cv2.resize(frame, (round(frame_w * scale), round(frame_h * scale)),
+                                   interpolation=cv2.INTER_AREA)
 
             # Encode as JPEG
-            ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
-            if not ret:
-                continue
+            frame_bytes = _encode_jpeg(frame, 70)
+            if frame_bytes is not None:
+                return frame_bytes
+
+    def snapshot_jpeg(self) -> Optional[bytes]:
+        """Read a fresh frame as JPEG bytes (blocking). None on failure."""
+        with self.lock:
+            # Drop the frame left in the buffer since the last read; on an
+            # idle capture it can be seconds old
+            self.cap.grab()
+            return self._read_jpeg()
+
+    def release(self) -> None:
+        with self.lock:
+            self.cap.release()
+
+    async def next_frame(self, after: int) -> Tuple[int, Optional[bytes]]:
+        """
+        Wait for a frame newer than sequence number `after`.
+
+        Returns (sequence, JPEG bytes); the bytes are None once the capture
+        breaks. Starts the shared reader if none is running.
+        """
+        if self._reader is None or self._reader.done():
+            after = max(after, self.frame_seq)  # Frame left from before going idle is stale
+            self._reader = asyncio.create_task(self._read_frames())
+        while self.frame_seq <= after and not self.broken:
+            await self._frame_event.wait()
+        return self.frame_seq, self.frame
+
+    def _publish(self, frame_bytes: Optional[bytes]) -> None:
+        self.frame = frame_bytes
+        self.frame_seq += 1
+        event, self._frame_event = self._frame_event, asyncio.Event()
+        event.set()
+
+    async def _read_frames(self) -> None:
+        """Read frames at PREVIEW_FPS while any client holds the capture."""
+        frame_interval = 1 / PREVIEW_FPS
+        next_frame_at = time.monotonic()
+        try:
+            while self.refs > 0 and not self.broken:
+                frame_bytes = await _in_camera_thread(self.read_jpeg)
+                if frame_bytes is None:
+                    self.broken = True  # Don't hand this capture to new clients
+                self._publish(frame_bytes)
+
+                # Limit frame rate: sleep only what's left of this frame's slot
+                next_frame_at += frame_interval
+                delay = next_frame_at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    next_frame_at = time.monotonic()  # Fell behind; don't burst to catch up
+        except Exception as e:
+            logger.error(f"Error reading preview frames from {self.device_path}: {e}")
+            self.broken = True
+            self._publish(None)
+
+
+def _preview_resolution() -> Tuple[int, int]:
+    """Preview size from vision.resolution, falling back to PREVIEW_RESOLUTION."""
+    try:
+        vision_config = load_config().get("vision") or {}
+        width, height = vision_config.get("resolution") or PREVIEW_RESOLUTION
+        width, height = int(width), int(height)
+    except (TypeError, ValueError):
+        return PREVIEW_RESOLUTION
+    if width <= 0 or height <= 0:
+        return PREVIEW_RESOLUTION
+    return width, height
+
+
+def _acquire_preview(device_path: str) -> _PreviewCapture:
+    """Get the shared capture for a device, opening it if needed (blocking)."""
+    with _preview_lock:
+        capture = _preview_cap.get(device_path)
+        if capture is not None and not capture.broken:
+            capture.refs += 1
+            return capture
+
+    # Open outside the lock; it can take hundreds of ms
+    opened = _PreviewCapture(device_path, _preview_resolution())
+
+    with _preview_lock:
+        capture = _preview_cap.get(device_path)
+        if capture is None or capture.broken:
+            _preview_cap[device_path] = capture = opened
+            opened = None
+        capture.refs += 1
+
+    if opened is not None:
+        opened.release()  # Lost the race to another client
+    return capture
+
+
+def _release_preview(capture: _PreviewCapture) -> Optional[float]:
+    """
+    Drop a client's reference to a shared capture.
 
-            frame_bytes = buffer.tobytes()
-            yield (
-                b'--frame\r\n'
-                b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n'
-            )
+    Returns the release timestamp if the capture is now idle and should be
+    closed after PREVIEW_IDLE_CLOSE, else None.
+    """
+    with _preview_lock:
+        capture.refs -= 1
+        capture.last_used = time.monotonic()
+        if capture.refs > 0:
+            return None
+        if capture.broken and _preview_cap.get(capture.device_path) is capture:
+            del _preview_cap[capture.device_path]
+        return capture.last_used
+
+
+def _close_idle_preview(capture: _PreviewCapture, released_at: float) -> None:
+    """Close a capture if nobody has used it since released_at."""
+    with _preview_lock:
+        if capture.refs > 0 or capture.last_used != released_at:
+            return  # Reused (a later release schedules its own close)
+        if _preview_cap.get(capture.device_path) is capture:
+            del _preview_cap[capture.device_path]
+    capture.release()
+
+
+def _schedule_idle_close(capture: _PreviewCapture) -> None:
+    """Release a client's reference and close the capture later if it goes idle."""
+    released_at = _release_preview(capture)
+    if released_at is not None:
+        # Off the loop: a read may still be finishing in its worker thread
+        loop = asyncio.get_running_loop()
+        delay = 0 if capture.broken else PREVIEW_IDLE_CLOSE
+        loop.call_later(delay, _start_idle_close, capture, released_at)
+
+
+def _start_idle_close(capture: _PreviewCapture, released_at: float) -> None:
+    """Run _close_idle_preview on the camera executor, logging any failure."""
+    future = asyncio.get_running_loop().run_in_executor(
+        _camera_executor, _close_idle_preview, capture, released_at,
+    )
+    future.add_done_callback(_log_idle_close_error)
+
+
+def _log_idle_close_error(future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Error closing idle camera preview: {future.exception()}")
+
+
+def close_preview(device_path: str) -> None:
+    """Close an idle shared capture now so another consumer can open the device."""
+    with _preview_lock:
+        capture = _preview_cap.get(device_path)
+        if capture is None or capture.refs > 0:
+            return
+        del _preview_cap[device_path]
+    capture.release()
 
-            # Limit frame rate
-            time.sleep(1/15)
 
-    except GeneratorExit:
-        pass
+async def _generate_mjpeg_frames(device_path: str) -> AsyncGenerator[bytes, None]:
+    """
+    Generate MJPEG frames for streaming.
+
+    Yields frames as multipart/x-mixed-replace content. MJPG-capable
+    cameras are passed through untouched; others are re-encoded. Clients
+    of the same device share one reader, so each gets the full
+    PREVIEW_FPS; a slow client skips to the latest frame.
+    """
+    capture = None
+    try:
+        capture = await _in_camera_thread(_acquire_preview, device_path)
+
+        seq = 0
+        while True:
+            seq, frame_bytes = await capture.next_frame(seq)
+            if frame_bytes is None:
+                break
+
+            # Part header and JPEG as separate chunks: no frame-sized concat
+            yield _MJPEG_PART_HEADER % len(frame_bytes)
+            yield frame_bytes
+
     except Exception as e:
         logger.error(f"Error generating frames: {e}")
     finally:
-        if cap:
-            cap.release()
+        if capture:
+            _schedule_idle_close(capture)
 
 
 # =============================================================================
@@ -223,28 +627,28 @@ def _generate_mjpeg_frames(device_path: str) -> Generator[bytes, None, None]:
 # =============================================================================
 
 @router.get("/status")
-async def get_camera_status():
+async def get_camera_status(request: Request):
     """
     Check if any camera is available.
 
-    Returns availability status and enabled state.
+    Returns availability status and enabled state (supports ETag revalidation).
     """
     try:
         config = load_config()
         vision_config = config.get("vision", {})
         enabled = vision_config.get("enabled", True)
 
-        cameras = get_available_cameras()
+        cameras = await get_available_cameras()
         working_cameras = [c for c in cameras if c.get("working", False)]
 
-        return {
+        return etag_response(request, {
             "success": True,
             "enabled": enabled,
             "available": len(working_cameras) > 0,
             "camera_count": len(cameras),
             "working_count": len(working_cameras),
             "current_device": vision_config.get("camera_device"),
-        }
+        }, max_age=int(CAMERAS_CACHE_TTL))
     except Exception as e:
         logger.error(f"Error checking camera status: {e}")
         return {
@@ -262,15 +666,12 @@ async def set_camera_enabled(request: EnableRequest):
     Toggle for users who don't have or don't want camera.
     """
     try:
-        config = load_config()
-        config.setdefault("vision", {})
-        config["vision"]["enabled"] = request.enabled
-
-        # Also update face tracking
-        config.setdefault("face_tracking", {})
-        config["face_tracking"]["enabled"] = request.enabled
-
-        save_config(config)
+        _invalidate_cameras_cache()
+        await asyncio.to_thread(update_config, {
+            "vision": {"enabled": request.enabled},
+            # Also update face tracking
+            "face_tracking": {"enabled": request.enabled},
+        })
 
         return {
             "success": True,
@@ -283,22 +684,39 @@ async def set_camera_enabled(request: EnableRequest):
 
 
 @router.get("/devices")
-async def list_cameras():
+async def list_cameras(request: Request):
     """
     List all available camera devices.
 
-    Returns list of cameras with their paths, names, and working status.
+    Returns list of cameras with their paths, names, and working status
+    (supports ETag revalidation).
     """
     try:
-        cameras = get_available_cameras()
-        return {
+        cameras = await get_available_cameras()
+        return etag_response(request, {
             "success": True,
             "cameras": cameras
-        }
+        }, max_age=int(CAMERAS_CACHE_TTL))
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+@router.get("/validate")
+async def validate_camera(device: str = Query(..., description="Camera device path")):
+    """
+    Check that a camera actually delivers frames.
+
+    Slower than the capability check used by /devices: opens the device
+    and reads a frame.
+    """
+    error = _check_device_path(device)
+    if error:
+        return {"success": False, "error": error}
+
+    working = await _in_camera_thread(_test_camera, device, True)
+    return {"success": True, "device": device, "working": working}
+
+
 @router.get("/preview")
 async def camera_preview(device: str = Query(..., description="Camera device path")):
     """
@@ -306,12 +724,9 @@ async def camera_preview(device: str = Query(..., description="Camera device pat
 
     Use this endpoint as <img src="..."> to display live preview.
     """
-    # Validate device path
-    if not device.startswith("/dev/"):
-        return {"success": False, "error": "Invalid device path"}
-
-    if not Path(device).exists():
-        return {"success": False, "error": f"Device not found: {device}"}
+    error = _check_device_path(device)
+    if error:
+        return {"success": False, "error": error}
 
     return StreamingResponse(
         _generate_mjpeg_frames(device),
@@ -323,24 +738,31 @@ async def camera_preview(device: str = Query(..., description="Camera device pat
 async def camera_snapshot(device: str = Query(..., description="Camera device path")):
     """
     Get a single JPEG snapshot from camera.
+
+    Uses the shared preview capture, so back-to-back snapshots (or a
+    snapshot while /preview is streaming) don't reopen the device.
     """
+    error = _check_device_path(device)
+    if error:
+        return {"success": False, "error": error}
+
     try:
-        cap = cv2.VideoCapture(device)
-        if not cap.isOpened():
+        try:
+            capture = await _in_camera_thread(_acquire_preview, device)
+        except RuntimeError:
             return {"success": False, "error": "Failed to open camera"}
 
-        ret, frame = cap.read()
-        cap.release()
+        try:
+            jpeg_bytes = await _in_camera_thread(capture.snapshot_jpeg)
+            if jpeg_bytes is None:
+                capture.broken = True
+        finally:
+            _schedule_idle_close(capture)
 
-        if not ret or frame is None:
+        if jpeg_bytes is None:
             return {"success": False, "error": "Failed to capture frame"}
 
-        ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-        if not ret:
-            return {"success": False, "error": "Failed to encode frame"}
-
-        from fastapi.responses import Response
-        return Response(content=buffer.tobytes(), media_type="image/jpeg")
+        return Response(content=jpeg_bytes, media_type="image/jpeg")
 
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -358,29 +780,29 @@ async def select_camera(request: CameraSelectRequest):
         camera_type = request.camera_type or "auto"
 
         # Validate device exists
-        if not Path(device).exists():
-            return {"success": False, "error": f"Device not found: {device}"}
+        error = _check_device_path(device)
+        if error:
+            return {"success": False, "error": error}
 
         # Note: We don't re-test the camera here because the preview stream
         # may still be holding it open. The preview already proves it works.
-
-        # Update config
-        config = load_config()
-
-        config.setdefault("vision", {})
-        config["vision"]["enabled"] = True
-        config["vision"]["camera_device"] = device
-        config["vision"]["camera_type"] = camera_type
-
-        # Mark setup step complete
-        config.setdefault("setup", {})
-        config["setup"].setdefault("steps_completed", {})
-        config["setup"]["steps_completed"]["camera"] = True
-        config["setup"].setdefault("camera", {})
-        config["setup"]["camera"]["enabled"] = True
-        config["setup"]["camera"]["tested"] = True
-
-        save_config(config)
+        # Free an idle preview capture so the vision service can open it.
+        await _in_camera_thread(close_preview, device)
+
+        _invalidate_cameras_cache()
+
+        # Update config and mark setup step complete
+        await asyncio.to_thread(update_config, {
+            "vision": {
+                "enabled": True,
+                "camera_device": device,
+                "camera_type": camera_type,
+            },
+            "setup": {
+                "steps_completed": {"camera": True},
+                "camera": {"enabled": True, "tested": True},
+            },
+        })
 
         return {
             "success": True,
@@ -401,25 +823,17 @@ async def skip_camera_setup():
     Disables camera features and marks step as complete.
     """
     try:
-        config = load_config()
-
-        # Disable vision
-        config.setdefault("vision", {})
-        config["vision"]["enabled"] = False
-
-        # Disable face tracking
-        config.setdefault("face_tracking", {})
-        config["face_tracking"]["enabled"] = False
-
-        # Mark setup step complete
-        config.setdefault("setup", {})
-        config["setup"].setdefault("steps_completed", {})
-        config["setup"]["steps_completed"]["camera"] = True
-        config["setup"].setdefault("camera", {})
-        config["setup"]["camera"]["enabled"] = False
-        config["setup"]["camera"]["tested"] = False
-
-        save_config(config)
+        _invalidate_cameras_cache()
+
+        # Disable vision and face tracking, mark setup step complete
+        await asyncio.to_thread(update_config, {
+            "vision": {"enabled": False},
+            "face_tracking": {"enabled": False},
+            "setup": {
+                "steps_completed": {"camera": True},
+                "camera": {"enabled": False, "tested": False},
+            },
+        })
 
         return {
             "success": True,
@@ -431,19 +845,19 @@ async def skip_camera_setup():
 
 
 @router.get("/config")
-async def get_camera_config():
-    """Get current camera configuration."""
+async def get_camera_config(request: Request):
+    """Get current camera configuration (supports ETag revalidation)."""
     try:
         config = load_config()
         vision_config = config.get("vision", {})
 
-        return {
+        return etag_response(request, {
             "success": True,
             "enabled": vision_config.get("enabled", False),
             "camera_type": vision_config.get("camera_type", "auto"),
             "camera_device": vision_config.get("camera_device"),
             "resolution": vision_config.get("resolution", [640, 480]),
             "fps": vision_config.get("fps", 30),
-        }
+        })
     except Exception as e:
         return {"success": False, "error": str(e)}
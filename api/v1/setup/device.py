@@ -8,13 +8,16 @@ Provides endpoints for:
 - Checking registration status
 """
 
+import asyncio
 import logging
 from typing import Optional
 
-from fastapi import APIRouter
+import httpx
+from fastapi import APIRouter, Request
 from pydantic import BaseModel
 
-from api.deps import load_config, save_config
+from api.cache import etag_response
+from api.deps import load_config, update_config, load_env, update_env, get_http_client
 from lelamp.user_data import (
     get_device_serial,
     get_device_serial_short,
@@ -64,20 +67,22 @@ class HubRegistrationResponse(BaseModel):
 # =============================================================================
 
 @router.get("/info")
-async def get_device_info_endpoint():
+async def get_device_info_endpoint(request: Request):
     """
     Get device information including serial number.
 
     Serial number is always read from hardware for security.
+    Supports ETag revalidation.
     """
     try:
-        info = get_device_info()
+        # Runs subprocesses (uname, driver board serial); keep off the event loop
+        info = await asyncio.to_thread(get_device_info)
 
         # Check registration status
         config = load_config()
         device_config = config.get("device", {})
 
-        return {
+        return etag_response(request, {
             "success": True,
             "device": {
                 "serial": info.get("serial"),
@@ -93,7 +98,7 @@ async def get_device_info_endpoint():
                 "registered": device_config.get("registered", False),
                 "user_linked": device_config.get("user_linked", False),
             }
-        }
+        })
     except Exception as e:
         logger.error(f"Error getting device info: {e}")
         return {
@@ -110,19 +115,17 @@ async def register_with_hub(request: HubRegistrationRequest):
     Sends device info to Hub and stores the returned API key.
     """
     try:
-        import httpx
-
         config = load_config()
         datacollection_config = config.get("datacollection", {})
 
         hub_url = request.hub_url or datacollection_config.get("hub_url", "http://192.168.10.10:8000")
 
-        # Get device info
-        info = get_device_info()
+        # Get device info (blocking probes run in a worker thread)
+        info = await asyncio.to_thread(get_device_info)
         info["lelamp_version"] = get_lelamp_version()
 
         # Register with Hub
-        response = httpx.post(
+        response = await get_http_client().post(
             f"{hub_url}/api/v1/devices/register",
             json={
                 "serial": info.get("serial"),
@@ -148,34 +151,13 @@ async def register_with_hub(request: HubRegistrationRequest):
             # Store API key in .env
             api_key = result.get("api_key")
             if api_key:
-                env_path = USER_DATA_DIR / ".env"
-                env_path.parent.mkdir(parents=True, exist_ok=True)
-
-                # Read existing .env
-                existing_content = ""
-                if env_path.exists():
-                    existing_content = env_path.read_text()
-                    # Remove existing HUB_API_KEY line
-                    lines = [l for l in existing_content.splitlines() if not l.startswith("HUB_API_KEY=")]
-                    existing_content = "\n".join(lines)
-
-                # Append API key
-                with open(env_path, "w") as f:
-                    if existing_content:
-                        f.write(existing_content.rstrip() + "\n")
-                    f.write(f"HUB_API_KEY={api_key}\n")
-
-                env_path.chmod(0o600)
+                await asyncio.to_thread(update_env, {"HUB_API_KEY": api_key})
 
             # Update config
-            config.setdefault("device", {})
-            config["device"]["registered"] = True
-            config["device"]["hub_url"] = hub_url
-
-            config.setdefault("datacollection", {})
-            config["datacollection"]["hub_url"] = hub_url
-
-            save_config(config)
+            await asyncio.to_thread(update_config, {
+                "device": {"registered": True, "hub_url": hub_url},
+                "datacollection": {"hub_url": hub_url},
+            })
 
             return {
                 "success": True,
@@ -205,25 +187,21 @@ async def register_with_hub(request: HubRegistrationRequest):
 
 
 @router.get("/registration-status")
-async def get_registration_status():
-    """Check if device is registered with Hub."""
+async def get_registration_status(request: Request):
+    """Check if device is registered with Hub (supports ETag revalidation)."""
     config = load_config()
     device_config = config.get("device", {})
 
     # Check for API key
-    has_api_key = False
-    env_path = USER_DATA_DIR / ".env"
-    if env_path.exists():
-        content = env_path.read_text()
-        has_api_key = "HUB_API_KEY=" in content and "HUB_API_KEY=\n" not in content
+    has_api_key = bool(load_env(USER_DATA_DIR / ".env").get("HUB_API_KEY"))
 
-    return {
+    return etag_response(request, {
         "success": True,
         "registered": device_config.get("registered", False),
         "has_api_key": has_api_key,
         "hub_url": device_config.get("hub_url"),
         "user_linked": device_config.get("user_linked", False)
-    }
+    })
 
 
 @router.get("/linking-code")
@@ -234,20 +212,12 @@ async def get_linking_code():
     The code can be used to link this device to a user account.
     """
     try:
-        import httpx
-
         config = load_config()
         datacollection_config = config.get("datacollection", {})
         hub_url = datacollection_config.get("hub_url", "http://192.168.10.10:8000")
 
         # Get API key
-        api_key = None
-        env_path = USER_DATA_DIR / ".env"
-        if env_path.exists():
-            for line in env_path.read_text().splitlines():
-                if line.startswith("HUB_API_KEY="):
-                    api_key = line.split("=", 1)[1].strip()
-                    break
+        api_key = load_env(USER_DATA_DIR / ".env").get("HUB_API_KEY")
 
         if not api_key:
             return {
@@ -259,7 +229,7 @@ async def get_linking_code():
         serial = get_device_serial()
 
         # Request linking code from Hub
-        response = httpx.get(
+        response = await get_http_client().get(
             f"{hub_url}/api/v1/devices/{serial}/linking-code",
             headers={
                 "Authorization": f"Bearer {api_key}",
@@ -294,7 +264,7 @@ async def get_linking_code():
 async def save_device_info_endpoint():
     """Save current device info to disk."""
     try:
-        path = save_device_info()
+        path = await asyncio.to_thread(save_device_info)
         return {
             "success": True,
             "path": str(path),
@@ -10,9 +10,10 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import Optional
 from pathlib import Path
+import asyncio
 import os
 
-from api.deps import load_config, save_config, get_config_path
+from api.deps import read_config, update_config, get_config_path, load_env
 
 router = APIRouter()
 
@@ -42,25 +43,23 @@ async def check_env():
                 "auto_skip": False
             }
 
-        with open(env_file, 'r') as f:
-            content = f.read()
+        env = load_env(env_file)
 
         # Check for non-empty values
-        has_openai = 'OPENAI_API_KEY=' in content and 'OPENAI_API_KEY=\n' not in content
-        has_livekit_url = 'LIVEKIT_URL=' in content and 'wss://' in content
-        has_livekit_key = 'LIVEKIT_API_KEY=' in content and 'LIVEKIT_API_KEY=\n' not in content
-        has_livekit_secret = 'LIVEKIT_API_SECRET=' in content and 'LIVEKIT_API_SECRET=\n' not in content
+        has_openai = bool(env.get('OPENAI_API_KEY'))
+        has_livekit_url = 'wss://' in env.get('LIVEKIT_URL', '')
+        has_livekit_key = bool(env.get('LIVEKIT_API_KEY'))
+        has_livekit_secret = bool(env.get('LIVEKIT_API_SECRET'))
 
         # Auto-mark environment step as complete if OpenAI key exists
         auto_skip = False
         if has_openai:
-            config = load_config()
+            config = read_config()
             steps_completed = config.get('setup', {}).get('steps_completed', {})
             if not steps_completed.get('environment', False):
-                config.setdefault('setup', {})
-                config['setup'].setdefault('steps_completed', {})
-                config['setup']['steps_completed']['environment'] = True
-                save_config(config)
+                await asyncio.to_thread(
+                    update_config, {'setup': {'steps_completed': {'environment': True}}}
+                )
                 auto_skip = True
 
         return {
@@ -74,6 +73,15 @@ async def check_env():
         return {"success": False, "error": str(e)}
 
 
+def _write_env_file(env_file: Path, content: str) -> None:
+    """Write the .env file (blocking)."""
+    with open(env_file, 'w') as f:
+        f.write(content)
+
+    # Secure the file (readable only by owner)
+    os.chmod(env_file, 0o600)
+
+
 @router.post("/save")
 async def save_env(data: EnvConfig):
     """Save environment configuration."""
@@ -90,18 +98,13 @@ async def save_env(data: EnvConfig):
             content += f"LIVEKIT_API_KEY={data.livekit_key}\n"
             content += f"LIVEKIT_API_SECRET={data.livekit_secret}\n"
 
-        with open(env_file, 'w') as f:
-            f.write(content)
-
-        # Secure the file (readable only by owner)
-        os.chmod(env_file, 0o600)
+        # File I/O off the event loop
+        await asyncio.to_thread(_write_env_file, env_file, content)
 
         # Mark step as complete in config
-        config = load_config()
-        config.setdefault('setup', {})
-        config['setup'].setdefault('steps_completed', {})
-        config['setup']['steps_completed']['environment'] = True
-        save_config(config)
+        await asyncio.to_thread(
+            update_config, {'setup': {'steps_completed': {'environment': True}}}
+        )
 
         return {"success": True, "message": "Environment configured"}
     except Exception as e:
@@ -10,17 +10,41 @@ Handles LiveKit Cloud setup:
 import asyncio
 import logging
 import os
-from typing import Optional
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Set, Tuple
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from pydantic import BaseModel
 
-from api.deps import load_config, save_config
+try:
+    from livekit import api as livekit_api
+    LIVEKIT_AVAILABLE = True
+except ImportError:
+    LIVEKIT_AVAILABLE = False
+    livekit_api = None
+
+from api.cache import encode_json, etag_bytes_response, etag_response
+from api.deps import load_env, update_config, update_env
+import lelamp.globals as g
 from lelamp.user_data import USER_DATA_DIR, get_device_serial_short
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# (api_key, api_secret) pairs that already produced a valid token
+_livekit_validated: Set[Tuple[str, str]] = set()
+
+# Last successful /status payload, served (marked stale) if a later read fails
+_last_good_status: Optional[dict] = None
+
+# Signed viewer tokens: (api_key, api_secret, room, identity) -> (expires_at, jwt).
+# Keyed on the credentials, so reconfiguring LiveKit never serves a stale token.
+VIEWER_TOKEN_TTL = 3600 * 24
+VIEWER_TOKEN_MIN_REMAINING = 3600  # Re-sign when less than this is left
+VIEWER_TOKEN_CACHE_SIZE = 32
+_viewer_tokens: Dict[Tuple[str, str, str, str], Tuple[float, str]] = {}
+
 
 # =============================================================================
 # Pydantic Models
@@ -44,70 +68,57 @@ class LiveKitTestResult(BaseModel):
 # Helper Functions
 # =============================================================================
 
-def get_env_value(key: str) -> Optional[str]:
-    """Get a value from .env file."""
-    env_path = USER_DATA_DIR / ".env"
-    if env_path.exists():
-        try:
-            for line in env_path.read_text().splitlines():
-                if "=" in line and not line.startswith("#"):
-                    k, v = line.split("=", 1)
-                    if k.strip() == key:
-                        return v.strip()
-        except Exception:
-            pass
-    return None
-
-
-def update_env_file(updates: dict):
-    """Update .env file with new values."""
-    env_path = USER_DATA_DIR / ".env"
-    env_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Read existing content
-    existing = {}
-    if env_path.exists():
-        for line in env_path.read_text().splitlines():
-            if "=" in line and not line.startswith("#"):
-                key, value = line.split("=", 1)
-                existing[key.strip()] = value.strip()
-
-    # Merge updates
-    existing.update(updates)
-
-    # Write back
-    with open(env_path, "w") as f:
-        for key, value in existing.items():
-            if value:  # Only write non-empty values
-                f.write(f"{key}={value}\n")
-
-    env_path.chmod(0o600)
-
-
+@lru_cache(maxsize=1)
 def get_room_name() -> str:
-    """Generate room name from device serial."""
+    """Generate room name from device serial (fixed for the process lifetime)."""
     serial = get_device_serial_short()
     return f"lelamp_{serial}"
 
 
+def get_livekit_credentials() -> Tuple[str, str, str]:
+    """
+    Get (url, api_key, api_secret), preferring the process environment.
+
+    Reads the .env file once for all three (load_env caches it by mtime).
+    Missing values are returned as "".
+    """
+    try:
+        env = load_env(USER_DATA_DIR / ".env")
+    except Exception:
+        env = {}
+
+    url, api_key, api_secret = (
+        os.getenv(key) or env.get(key) or ""
+        for key in ("LIVEKIT_URL", "LIVEKIT_API_KEY", "LIVEKIT_API_SECRET")
+    )
+    return url, api_key, api_secret
+
+
 def is_livekit_configured() -> bool:
     """Check if LiveKit credentials are configured."""
-    url = os.getenv("LIVEKIT_URL") or get_env_value("LIVEKIT_URL")
-    api_key = os.getenv("LIVEKIT_API_KEY") or get_env_value("LIVEKIT_API_KEY")
-    api_secret = os.getenv("LIVEKIT_API_SECRET") or get_env_value("LIVEKIT_API_SECRET")
-
-    return bool(url and api_key and api_secret)
+    return all(get_livekit_credentials())
 
 
 async def test_livekit_connection(url: str, api_key: str, api_secret: str) -> tuple:
     """
     Test LiveKit connection by generating a token and verifying credentials.
 
+    Credentials that validated once are remembered for the process lifetime,
+    so repeat tests skip token signing.
+
     Returns (success, message)
     """
-    try:
-        from livekit import api as livekit_api
+    if (api_key, api_secret) in _livekit_validated:
+        return True, "Credentials valid"
 
+    # Cheap structural checks before signing
+    if not api_key or not api_secret or any(c.isspace() for c in api_key + api_secret):
+        return False, "Invalid API key or secret"
+
+    if not LIVEKIT_AVAILABLE:
+        return False, "LiveKit SDK not installed"
+
+    try:
         # Create access token to verify credentials work
         token = livekit_api.AccessToken(api_key, api_secret)
         token.with_identity("test_connection")
@@ -123,12 +134,11 @@ async def test_livekit_connection(url: str, api_key: str, api_secret: str) -> tu
         jwt = token.to_jwt()
 
         if jwt and len(jwt) > 50:
+            _livekit_validated.add((api_key, api_secret))
             return True, "Credentials valid"
         else:
             return False, "Failed to generate access token"
 
-    except ImportError:
-        return False, "LiveKit SDK not installed"
     except Exception as e:
         error_msg = str(e)
         if "invalid" in error_msg.lower():
@@ -141,18 +151,21 @@ async def test_livekit_connection(url: str, api_key: str, api_secret: str) -> tu
 # =============================================================================
 
 @router.get("/status")
-async def get_livekit_status():
+async def get_livekit_status(request: Request):
     """
     Get current LiveKit configuration and service status.
 
-    Returns configuration status and live service status if available.
+    Returns configuration status and live service status if available
+    (supports ETag revalidation). If reading the status fails after an
+    earlier success, the last good status is returned with "stale": True.
     """
+    global _last_good_status
+
     try:
         # Try to get status from livekit_service if available
-        import lelamp.globals as g
         if g.livekit_service:
             status_dict = g.livekit_service.get_status_dict()
-            return {
+            status = {
                 "success": True,
                 "configured": status_dict["configured"],
                 "room_name": status_dict["room_name"],
@@ -164,11 +177,11 @@ async def get_livekit_status():
                 "api_key": g.livekit_service.credentials.api_key if g.livekit_service.credentials else "",
                 "api_secret_masked": "****" if g.livekit_service.credentials and g.livekit_service.credentials.api_secret else "",
             }
+            _last_good_status = status
+            return etag_response(request, status)
 
         # Fallback to reading from env/files if service not initialized
-        url = os.getenv("LIVEKIT_URL") or get_env_value("LIVEKIT_URL") or ""
-        api_key = os.getenv("LIVEKIT_API_KEY") or get_env_value("LIVEKIT_API_KEY") or ""
-        api_secret = os.getenv("LIVEKIT_API_SECRET") or get_env_value("LIVEKIT_API_SECRET") or ""
+        url, api_key, api_secret = get_livekit_credentials()
 
         configured = bool(url and api_key and api_secret)
         room_name = get_room_name()
@@ -178,7 +191,7 @@ async def get_livekit_status():
         if api_secret:
             masked_secret = api_secret[:4] + "..." + api_secret[-4:] if len(api_secret) > 8 else "****"
 
-        return {
+        status = {
             "success": True,
             "configured": configured,
             "room_name": room_name,
@@ -188,9 +201,13 @@ async def get_livekit_status():
             "api_key": api_key,
             "api_secret_masked": masked_secret,
         }
+        _last_good_status = status
+        return etag_response(request, status)
 
     except Exception as e:
         logger.error(f"Error getting LiveKit status: {e}")
+        if _last_good_status is not None:
+            return {**_last_good_status, "stale": True, "error": str(e)}
         return {
             "success": False,
             "error": str(e)
@@ -217,7 +234,7 @@ async def configure_livekit(config: LiveKitConfig):
         if not config.url.startswith("wss://"):
             return {"success": False, "error": "URL must start with wss://"}
 
-        # Test connection before saving
+        # Test credentials before saving (local token signing, no network I/O)
         success, message = await test_livekit_connection(
             config.url, config.api_key, config.api_secret
         )
@@ -228,22 +245,20 @@ async def configure_livekit(config: LiveKitConfig):
                 "error": f"Connection test failed: {message}"
             }
 
-        # Save to .env file
-        update_env_file({
-            "LIVEKIT_URL": config.url,
-            "LIVEKIT_API_KEY": config.api_key,
-            "LIVEKIT_API_SECRET": config.api_secret,
-        })
-
-        # Mark setup step complete
-        app_config = load_config()
-        app_config.setdefault("setup", {})
-        app_config["setup"].setdefault("steps_completed", {})
-        app_config["setup"]["steps_completed"]["livekit"] = True
-        save_config(app_config)
+        # Save to .env file and mark setup step complete (separate files,
+        # written concurrently off the event loop)
+        await asyncio.gather(
+            asyncio.to_thread(update_env, {
+                "LIVEKIT_URL": config.url,
+                "LIVEKIT_API_KEY": config.api_key,
+                "LIVEKIT_API_SECRET": config.api_secret,
+            }),
+            asyncio.to_thread(
+                update_config, {"setup": {"steps_completed": {"livekit": True}}}
+            ),
+        )
 
         # Reload credentials in livekit_service if available
-        import lelamp.globals as g
         if g.livekit_service:
             g.livekit_service.reload_credentials()
             logger.info("LiveKit service credentials reloaded")
@@ -273,9 +288,7 @@ async def test_connection():
     Verifies that stored credentials can connect to LiveKit Cloud.
     """
     try:
-        url = os.getenv("LIVEKIT_URL") or get_env_value("LIVEKIT_URL")
-        api_key = os.getenv("LIVEKIT_API_KEY") or get_env_value("LIVEKIT_API_KEY")
-        api_secret = os.getenv("LIVEKIT_API_SECRET") or get_env_value("LIVEKIT_API_SECRET")
+        url, api_key, api_secret = get_livekit_credentials()
 
         if not all([url, api_key, api_secret]):
             return {
@@ -301,9 +314,9 @@ async def test_connection():
 
 
 @router.get("/room-name")
-async def get_device_room_name():
+async def get_device_room_name(request: Request):
     """
-    Get the room name for this device.
+    Get the room name for this device (supports ETag revalidation).
 
     Room name is based on device serial: lelamp_<serial>
     """
@@ -311,11 +324,11 @@ async def get_device_room_name():
         room_name = get_room_name()
         serial = get_device_serial_short()
 
-        return {
+        return etag_response(request, {
             "success": True,
             "room_name": room_name,
             "serial": serial,
-        }
+        })
 
     except Exception as e:
         logger.error(f"Error getting room name: {e}")
@@ -325,41 +338,88 @@ async def get_device_room_name():
         }
 
 
+# LiveKit Cloud setup steps for /guide (static; the room name is per device)
+_GUIDE_STEPS = [
+    {
+        "step": 1,
+        "title": "Create LiveKit Cloud Account",
+        "description": "Go to cloud.livekit.io and sign up for a free account.",
+        "url": "https://cloud.livekit.io",
+    },
+    {
+        "step": 2,
+        "title": "Create a Project",
+        "description": "After signing in, create a new project. You can name it 'LeLamp' or anything you prefer.",
+    },
+    {
+        "step": 3,
+        "title": "Get Your Credentials",
+        "description": "In your project settings, find the API Keys section. Copy the WebSocket URL, API Key, and API Secret.",
+    },
+    {
+        "step": 4,
+        "title": "Enter Credentials Below",
+        "description": "Paste your credentials in the form below. Your room will be automatically named based on your device.",
+    },
+]
+
+
+@lru_cache(maxsize=1)
+def _guide_body() -> Tuple[bytes, str]:
+    """Serialized /guide response and its ETag, built once per process."""
+    return encode_json({
+        "success": True,
+        "steps": _GUIDE_STEPS,
+        "room_name": get_room_name(),
+        "free_tier_info": "LiveKit Cloud offers a generous free tier with 50GB of bandwidth per month.",
+    })
+
+
 @router.get("/guide")
-async def get_setup_guide():
+async def get_setup_guide(request: Request):
     """
     Get LiveKit Cloud setup instructions.
 
-    Returns step-by-step guide for users to get their credentials.
+    Returns step-by-step guide for users to get their credentials
+    (supports ETag revalidation).
     """
-    return {
-        "success": True,
-        "steps": [
-            {
-                "step": 1,
-                "title": "Create LiveKit Cloud Account",
-                "description": "Go to cloud.livekit.io and sign up for a free account.",
-                "url": "https://cloud.livekit.io",
-            },
-            {
-                "step": 2,
-                "title": "Create a Project",
-                "description": "After signing in, create a new project. You can name it 'LeLamp' or anything you prefer.",
-            },
-            {
-                "step": 3,
-                "title": "Get Your Credentials",
-                "description": "In your project settings, find the API Keys section. Copy the WebSocket URL, API Key, and API Secret.",
-            },
-            {
-                "step": 4,
-                "title": "Enter Credentials Below",
-                "description": "Paste your credentials in the form below. Your room will be automatically named based on your device.",
-            },
-        ],
-        "room_name": get_room_name(),
-        "free_tier_info": "LiveKit Cloud offers a generous free tier with 50GB of bandwidth per month.",
-    }
+    body, etag = _guide_body()
+    return etag_bytes_response(request, body, etag, max_age=60)
+
+
+def _get_viewer_jwt(api_key: str, api_secret: str, room_name: str, identity: str) -> str:
+    """
+    Get a signed viewer token, reusing a cached one while it has at least
+    VIEWER_TOKEN_MIN_REMAINING seconds left.
+    """
+    key = (api_key, api_secret, room_name, identity)
+    now = time.monotonic()
+    cached = _viewer_tokens.get(key)
+    if cached is not None and cached[0] - now > VIEWER_TOKEN_MIN_REMAINING:
+        return cached[1]
+
+    # Create access token for viewer
+    token = livekit_api.AccessToken(api_key, api_secret)
+    token.with_identity(identity)
+    token.with_name(f"Viewer ({identity})")
+    token.with_ttl(VIEWER_TOKEN_TTL)
+
+    # Grant permissions - can subscribe to audio/video but not publish
+    token.with_grants(livekit_api.VideoGrants(
+        room_join=True,
+        room=room_name,
+        can_subscribe=True,
+        can_publish=False,  # Viewer only, no publishing
+    ))
+
+    jwt = token.to_jwt()
+
+    # Identity comes from the query string; keep the cache bounded
+    _viewer_tokens.pop(key, None)
+    while len(_viewer_tokens) >= VIEWER_TOKEN_CACHE_SIZE:
+        del _viewer_tokens[next(iter(_viewer_tokens))]  # Oldest first
+    _viewer_tokens[key] = (now + VIEWER_TOKEN_TTL, jwt)
+    return jwt
 
 
 @router.get("/viewer-token")
@@ -374,12 +434,14 @@ async def get_viewer_token(identity: str = "desktop_viewer"):
     2. Go to https://meet.livekit.io or LiveKit Playground
     3. Use custom connection with the returned URL and token
     """
-    try:
-        import livekit.api as livekit_api
+    if not LIVEKIT_AVAILABLE:
+        return {
+            "success": False,
+            "error": "livekit package not installed"
+        }
 
-        url = os.getenv("LIVEKIT_URL") or get_env_value("LIVEKIT_URL")
-        api_key = os.getenv("LIVEKIT_API_KEY") or get_env_value("LIVEKIT_API_KEY")
-        api_secret = os.getenv("LIVEKIT_API_SECRET") or get_env_value("LIVEKIT_API_SECRET")
+    try:
+        url, api_key, api_secret = get_livekit_credentials()
 
         if not all([url, api_key, api_secret]):
             return {
@@ -388,22 +450,7 @@ async def get_viewer_token(identity: str = "desktop_viewer"):
             }
 
         room_name = get_room_name()
-
-        # Create access token for viewer
-        token = livekit_api.AccessToken(api_key, api_secret)
-        token.with_identity(identity)
-        token.with_name(f"Viewer ({identity})")
-        token.with_ttl(3600 * 24)  # 24 hour token
-
-        # Grant permissions - can subscribe to audio/video but not publish
-        token.with_grants(livekit_api.VideoGrants(
-            room_join=True,
-            room=room_name,
-            can_subscribe=True,
-            can_publish=False,  # Viewer only, no publishing
-        ))
-
-        jwt = token.to_jwt()
+        jwt = _get_viewer_jwt(api_key, api_secret, room_name, identity)
 
         return {
             "success": True,
@@ -422,11 +469,6 @@ async def get_viewer_token(identity: str = "desktop_viewer"):
             ]
         }
 
-    except ImportError:
-        return {
-            "success": False,
-            "error": "livekit package not installed"
-        }
     except Exception as e:
         logger.error(f"Error generating viewer token: {e}")
         return {
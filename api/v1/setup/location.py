@@ -4,17 +4,38 @@ Location configuration endpoints.
 Handles location and timezone settings with geocoding support.
 """
 
+import asyncio
+import os
+import time
+from collections import OrderedDict
+
 import httpx
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from pydantic import BaseModel
 from typing import Optional, List
-import subprocess
 import logging
 
-from api.deps import load_config, save_config
+try:
+    from timezonefinder import TimezoneFinder
+    TIMEZONEFINDER_AVAILABLE = True
+except ImportError:
+    TIMEZONEFINDER_AVAILABLE = False
+    TimezoneFinder = None
+
+from api.cache import etag_response
+from api.deps import load_config, update_config, get_http_client
 
 router = APIRouter()
 
+# Geocoding results by normalized query: query -> (monotonic timestamp, results).
+# Typeahead repeats queries; this also keeps us under Nominatim's rate limit.
+GEOCODE_CACHE_SIZE = 512
+GEOCODE_CACHE_TTL = 3600.0
+_geocode_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+# TimezoneFinder loads its lookup tables on construction; build it once
+_timezone_finder = None
+
 
 class GeocodingResult(BaseModel):
     """Result from geocoding search."""
@@ -40,47 +61,57 @@ async def search_city(q: str) -> dict:
     if not q or len(q) < 2:
         return {"success": False, "error": "Search query too short", "results": []}
 
+    query = " ".join(q.lower().split())
+    cached = _geocode_cache.get(query)
+    if cached is not None and time.monotonic() - cached[0] < GEOCODE_CACHE_TTL:
+        _geocode_cache.move_to_end(query)
+        return {"success": True, "results": cached[1]}
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://nominatim.openstreetmap.org/search",
-                params={
-                    "q": q,
-                    "format": "json",
-                    "addressdetails": 1,
-                    "limit": 5,
-                },
-                headers={
-                    "User-Agent": "LeLamp-RobotLamp/1.0 (https://github.com/boxbots/lelamp; lelamp@boxbots.io)"
-                },
-                timeout=10.0
+        response = await get_http_client().get(
+            "https://nominatim.openstreetmap.org/search",
+            params={
+                "q": query,
+                "format": "json",
+                "addressdetails": 1,
+                "limit": 5,
+            },
+            headers={
+                "User-Agent": "LeLamp-RobotLamp/1.0 (https://github.com/boxbots/lelamp; lelamp@boxbots.io)"
+            },
+            timeout=10.0
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        results = []
+        for item in data:
+            address = item.get("address", {})
+            city = (
+                address.get("city") or
+                address.get("town") or
+                address.get("village") or
+                address.get("municipality") or
+                item.get("name", "")
             )
-            response.raise_for_status()
-            data = response.json()
-
-            results = []
-            for item in data:
-                address = item.get("address", {})
-                city = (
-                    address.get("city") or
-                    address.get("town") or
-                    address.get("village") or
-                    address.get("municipality") or
-                    item.get("name", "")
-                )
-                region = address.get("state") or address.get("province") or ""
-                country = address.get("country", "")
-
-                results.append({
-                    "city": city,
-                    "region": region,
-                    "country": country,
-                    "lat": float(item.get("lat", 0)),
-                    "lon": float(item.get("lon", 0)),
-                    "display_name": item.get("display_name", ""),
-                })
-
-            return {"success": True, "results": results}
+            region = address.get("state") or address.get("province") or ""
+            country = address.get("country", "")
+
+            results.append({
+                "city": city,
+                "region": region,
+                "country": country,
+                "lat": float(item.get("lat", 0)),
+                "lon": float(item.get("lon", 0)),
+                "display_name": item.get("display_name", ""),
+            })
+
+        _geocode_cache[query] = (time.monotonic(), results)
+        _geocode_cache.move_to_end(query)
+        if len(_geocode_cache) > GEOCODE_CACHE_SIZE:
+            _geocode_cache.popitem(last=False)
+
+        return {"success": True, "results": results}
 
     except httpx.TimeoutException:
         return {"success": False, "error": "Search timed out", "results": []}
@@ -98,12 +129,12 @@ class LocationConfig(BaseModel):
 
 
 @router.get("/")
-async def get_location():
-    """Get current location configuration."""
+async def get_location(request: Request):
+    """Get current location configuration (supports ETag revalidation)."""
     try:
         config = load_config()
         location = config.get('location', {})
-        return {
+        return etag_response(request, {
             "success": True,
             "city": location.get('city', ''),
             "region": location.get('region', ''),
@@ -111,11 +142,56 @@ async def get_location():
             "timezone": location.get('timezone', 'UTC'),
             "lat": location.get('lat', 0.0),
             "lon": location.get('lon', 0.0)
-        }
+        })
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+def _timezone_at(lat: float, lon: float) -> Optional[str]:
+    """Timezone name for coordinates (blocking; first call loads the tables)."""
+    global _timezone_finder
+    if _timezone_finder is None:
+        _timezone_finder = TimezoneFinder()
+    return _timezone_finder.timezone_at(lat=lat, lng=lon)
+
+
+def _system_timezone() -> Optional[str]:
+    """Current system timezone from the /etc/localtime symlink, or None."""
+    try:
+        target = os.readlink("/etc/localtime")
+    except OSError:
+        return None
+    _, sep, name = target.partition("zoneinfo/")
+    return name if sep else None
+
+
+async def _set_system_timezone(timezone: str) -> str:
+    """
+    Set the system timezone with timedatectl without blocking the event loop.
+
+    Skips the sudo/timedatectl round trip when the timezone is already set.
+    Returns a status message.
+    """
+    if _system_timezone() == timezone:
+        return f"System timezone already set to {timezone}"
+
+    proc = await asyncio.create_subprocess_exec(
+        'sudo', 'timedatectl', 'set-timezone', timezone,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout=5)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return "Could not update system timezone: timedatectl timed out"
+
+    if proc.returncode == 0:
+        return f"System timezone updated to {timezone}"
+    return f"Could not update system timezone: {stderr.decode(errors='replace')}"
+
+
 @router.post("/")
 async def save_location(data: LocationConfig):
     """Save location configuration."""
@@ -124,47 +200,29 @@ async def save_location(data: LocationConfig):
             return {"success": False, "error": "City is required"}
 
         # Try to determine timezone from coordinates
-        timezone = "UTC"
-        try:
-            from timezonefinder import TimezoneFinder
-            tf = TimezoneFinder()
-            tz = tf.timezone_at(lat=data.lat, lng=data.lon)
+        timezone = "UTC"  # If timezonefinder isn't installed
+        if TIMEZONEFINDER_AVAILABLE:
+            tz = await asyncio.to_thread(_timezone_at, data.lat, data.lon)
             if tz:
                 timezone = tz
-        except ImportError:
-            pass  # timezonefinder not installed, use UTC
 
-        # Update config
-        config = load_config()
-        config['location'] = {
-            'city': data.city,
-            'region': data.region or '',
-            'country': data.country or '',
-            'timezone': timezone,
-            'lat': data.lat,
-            'lon': data.lon
-        }
-
-        # Mark location step as complete
-        config.setdefault('setup', {})
-        config['setup'].setdefault('steps_completed', {})
-        config['setup']['steps_completed']['location'] = True
-
-        save_config(config)
+        # Update config and mark location step as complete (off the event loop)
+        await asyncio.to_thread(update_config, {
+            'location': {
+                'city': data.city,
+                'region': data.region or '',
+                'country': data.country or '',
+                'timezone': timezone,
+                'lat': data.lat,
+                'lon': data.lon
+            },
+            'setup': {'steps_completed': {'location': True}},
+        })
 
         # Try to update system timezone
         system_tz_message = ""
         try:
-            result = subprocess.run(
-                ['sudo', 'timedatectl', 'set-timezone', timezone],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                system_tz_message = f"System timezone updated to {timezone}"
-            else:
-                system_tz_message = f"Could not update system timezone: {result.stderr}"
+            system_tz_message = await _set_system_timezone(timezone)
         except Exception as e:
             system_tz_message = f"Could not update system timezone: {str(e)}"
 
@@ -5,17 +5,24 @@ Handles LeLamp character selection, name, and favorite color settings.
 Loads actual character definitions from lelamp/personality/characters/.
 """
 
+import asyncio
 import json
 import logging
+import os
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from pydantic import BaseModel
 
-from api.deps import load_config, save_config
+from api.cache import encode_json, etag_bytes_response, etag_response
+from api.deps import load_config, update_config
+from api.responses import FastJSONResponse, ORJSON_AVAILABLE
 
-router = APIRouter()
+if ORJSON_AVAILABLE:
+    import orjson
+
+router = APIRouter(default_response_class=FastJSONResponse)
 logger = logging.getLogger(__name__)
 
 # Path to character files
@@ -42,18 +49,74 @@ class PersonalityConfig(BaseModel):
     default_color: Optional[List[int]] = None  # RGB array like [0, 0, 150]
 
 
-def load_characters() -> List[CharacterInfo]:
-    """Load all character definitions from the characters directory."""
-    characters = []
+# Parsed characters, rebuilt when the directory signature changes. "dumped" and
+# "response" (the serialized /characters body and its ETag) are built with it.
+# A rebuild publishes a new dict in one assignment, so readers never see a
+# new "sig" next to old contents; always go through the module global.
+_characters_cache: Dict[str, Any] = {
+    "sig": None,
+    "list": [],
+    "by_id": {},
+    "dumped": [],
+    "response": encode_json({"success": True, "characters": []}),
+}
 
-    if not CHARACTERS_DIR.exists():
+
+def _characters_signature() -> Optional[Tuple[Tuple[str, int, int], ...]]:
+    """(name, mtime_ns, size) of each character file, or None if the directory is missing."""
+    try:
+        with os.scandir(CHARACTERS_DIR) as entries:
+            return tuple(sorted(
+                (entry.name, st.st_mtime_ns, st.st_size)
+                for entry in entries
+                if entry.name.endswith(".json") and entry.is_file()
+                for st in (entry.stat(),)
+            ))
+    except OSError:
+        return None
+
+
+def load_characters() -> List[CharacterInfo]:
+    """
+    Load all character definitions from the characters directory.
+
+    The files are only re-read when one is added, removed or modified.
+    Treat the result as read-only.
+    """
+    global _characters_cache
+
+    sig = _characters_signature()
+    cache = _characters_cache
+    if sig is not None and sig == cache["sig"]:
+        return cache["list"]
+
+    # The signature already lists the files, sorted by name
+    characters = _read_characters([name for name, _, _ in sig]) if sig is not None else []
+    if sig is None:
         logger.warning(f"Characters directory not found: {CHARACTERS_DIR}")
-        return characters
 
-    for json_file in sorted(CHARACTERS_DIR.glob("*.json")):
+    dumped = [c.model_dump() for c in characters]
+    _characters_cache = {
+        "sig": sig,
+        "list": characters,
+        "by_id": {char.id: char for char in characters},
+        "dumped": dumped,
+        "response": encode_json({"success": True, "characters": dumped}),
+    }
+    return characters
+
+
+def _read_characters(names: List[str]) -> List[CharacterInfo]:
+    """Parse the given character JSON files (in order)."""
+    characters = []
+
+    for json_file in (CHARACTERS_DIR / name for name in names):
         try:
-            with open(json_file, 'r') as f:
-                data = json.load(f)
+            if ORJSON_AVAILABLE:
+                data = orjson.loads(json_file.read_bytes())
+            else:
+                with open(json_file, 'r') as f:
+                    data = json.load(f)
 
             character = CharacterInfo(
                 id=json_file.stem,  # Filename without extension
@@ -75,66 +138,81 @@ def load_characters() -> List[CharacterInfo]:
 
 def get_character(character_id: str) -> Optional[CharacterInfo]:
     """Get a specific character by ID."""
-    characters = load_characters()
-    for char in characters:
-        if char.id == character_id:
-            return char
-    return None
+    load_characters()  # Refresh the cache if the files changed
+    return _characters_cache["by_id"].get(character_id)
+
+
+async def load_characters_async() -> List[CharacterInfo]:
+    """
+    load_characters for async handlers.
+
+    Cache hits are served inline; a (re)load, which opens and parses every
+    character file, runs in a worker thread so it doesn't block the loop.
+    """
+    cache = _characters_cache
+    if _characters_signature() == cache["sig"]:
+        return cache["list"]
+    return await asyncio.to_thread(load_characters)
+
+
+async def get_character_async(character_id: str) -> Optional[CharacterInfo]:
+    """get_character for async handlers (see load_characters_async)."""
+    await load_characters_async()
+    return _characters_cache["by_id"].get(character_id)
 
 
 @router.get("/")
-async def get_personality():
-    """Get current personality configuration and available characters."""
+async def get_personality(request: Request):
+    """Get current personality configuration and available characters (supports ETag revalidation)."""
     try:
         config = load_config()
         personality = config.get('personality', {})
         rgb_config = config.get('rgb', {})
 
-        # Load available characters
-        characters = load_characters()
+        # Load available characters (serialized with the cache)
+        await load_characters_async()
 
         # Get current character
         current_character_id = personality.get('character_id', 'LeLamp')
-        current_character = get_character(current_character_id)
+        current_character = await get_character_async(current_character_id)
 
-        return {
+        return etag_response(request, {
             "success": True,
             "name": personality.get('name', 'LeLamp'),
             "character_id": current_character_id,
             "character": current_character.model_dump() if current_character else None,
             "default_color": rgb_config.get('default_color', [0, 0, 150]),
-            "characters": [c.model_dump() for c in characters],
-        }
+            "characters": _characters_cache["dumped"],
+        })
     except Exception as e:
         logger.error(f"Error getting personality: {e}")
         return {"success": False, "error": str(e)}
 
 
 @router.get("/characters")
-async def list_characters():
-    """List all available character personalities."""
+async def list_characters(request: Request):
+    """List all available character personalities (supports ETag revalidation)."""
     try:
-        characters = load_characters()
-        return {
-            "success": True,
-            "characters": [c.model_dump() for c in characters],
-        }
+        # Body is serialized once per cache rebuild
+        await load_characters_async()
+        body, etag = _characters_cache["response"]
+        return etag_bytes_response(request, body, etag)
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
 @router.get("/characters/{character_id}")
-async def get_character_details(character_id: str):
-    """Get details for a specific character."""
+async def get_character_details(character_id: str, request: Request):
+    """Get details for a specific character (supports ETag revalidation)."""
     try:
-        character = get_character(character_id)
+        character = await get_character_async(character_id)
         if not character:
             return {"success": False, "error": f"Character not found: {character_id}"}
 
-        return {
+        return etag_response(request, {
             "success": True,
             "character": character.model_dump(),
-        }
+        })
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -143,7 +221,10 @@ def hex_to_rgb(hex_color: str) -> List[int]:
     """Convert hex color string to RGB list."""
     hex_color = hex_color.lstrip('#')
     if len(hex_color) == 6:
-        return [int(hex_color[i:i+2], 16) for i in (0, 2, 4)]
+        try:
+            return list(bytes.fromhex(hex_color))
+        except ValueError:
+            pass
     return [100, 100, 255]  # Default blue if invalid
 
 
@@ -151,35 +232,30 @@ def hex_to_rgb(hex_color: str) -> List[int]:
 async def save_personality(data: PersonalityConfig):
     """Save personality configuration."""
     try:
-        config = load_config()
-
-        # Get character details
-        character = get_character(data.character_id)
+        # Get character details (before touching the config)
+        character = await get_character_async(data.character_id)
         if not character:
             return {"success": False, "error": f"Character not found: {data.character_id}"}
 
-        # Update personality config
-        config.setdefault('personality', {})
-        config['personality']['name'] = data.name
-        config['personality']['character_id'] = data.character_id
-        config['personality']['description'] = character.description
-        config['personality']['speech_style'] = character.speech_style
-        config['personality']['voice_model'] = character.voice_model
+        patch = {
+            'personality': {
+                'name': data.name,
+                'character_id': data.character_id,
+                'description': character.description,
+                'speech_style': character.speech_style,
+                'voice_model': character.voice_model,
+            },
+            # Update ID based on name (for device identification)
+            'id': data.name.lower().replace(' ', '_'),
+            # Mark step complete
+            'setup': {'steps_completed': {'personality': True}},
+        }
 
         # Save default color if provided (RGB array)
         if data.default_color:
-            config.setdefault('rgb', {})
-            config['rgb']['default_color'] = data.default_color
-
-        # Update ID based on name (for device identification)
-        config['id'] = data.name.lower().replace(' ', '_')
-
-        # Mark step complete
-        config.setdefault('setup', {})
-        config['setup'].setdefault('steps_completed', {})
-        config['setup']['steps_completed']['personality'] = True
+            patch['rgb'] = {'default_color': data.default_color}
 
-        save_config(config)
+        await asyncio.to_thread(update_config, patch)
 
         return {
             "success": True,
@@ -202,19 +278,12 @@ class FavoriteColorRequest(BaseModel):
 async def set_favorite_color(data: FavoriteColorRequest):
     """Set the lamp's favorite color and update RGB defaults."""
     try:
-        config = load_config()
-
-        # Save to personality
-        config.setdefault('personality', {})
-        config['personality']['favorite_color'] = data.color
-
-        # Also set as default RGB animation color
+        # Save to personality, and also set as default RGB animation color
         rgb_color = hex_to_rgb(data.color)
-        config.setdefault('rgb', {})
-        config['rgb']['default_color'] = rgb_color
-        config['rgb']['default_animation'] = 'ripple'
-
-        save_config(config)
+        await asyncio.to_thread(update_config, {
+            'personality': {'favorite_color': data.color},
+            'rgb': {'default_color': rgb_color, 'default_animation': 'ripple'},
+        })
 
         return {
             "success": True,
@@ -6,18 +6,29 @@ Provides toggle to enable/disable RGB if user doesn't have LEDs.
 """
 
 import asyncio
+import importlib.util
 import logging
 import os
+from functools import lru_cache
+from typing import Optional
 
 from fastapi import APIRouter
 from pydantic import BaseModel
 
-from api.deps import load_config, save_config
+from api.deps import read_config, update_config
 import lelamp.globals as g
 
+try:
+    from lelamp.service.rgb.sequences import list_animations as _list_animations
+except ImportError:
+    _list_animations = None
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Scheduled LED clear after a test animation (see _clear_leds_after_delay)
+_pending_clear: Optional[asyncio.TimerHandle] = None
+
 
 class BrightnessRequest(BaseModel):
     brightness: int  # 0-100
@@ -33,20 +44,25 @@ class ColorRequest(BaseModel):
     b: int = 0
 
 
+@lru_cache(maxsize=1)
 def _is_pi5() -> bool:
+    """Check the board model (cached; it can't change while running)."""
     try:
-        with open("/proc/device-tree/model", "r") as f:
-            return "raspberry pi 5" in f.read().lower()
-    except Exception:
+        fd = os.open("/proc/device-tree/model", os.O_RDONLY)
+        try:
+            return b"raspberry pi 5" in os.read(fd, 256).lower()
+        finally:
+            os.close(fd)
+    except OSError:
         return False
 
 
+@lru_cache(maxsize=1)
 def _has_lgpio() -> bool:
-    """Check if lgpio is available (used for Pi 5 RGB)."""
+    """Check if lgpio is available (used for Pi 5 RGB) without importing it."""
     try:
-        import lgpio
-        return True
-    except ImportError:
+        return importlib.util.find_spec("lgpio") is not None
+    except (ImportError, ValueError):
         return False
 
 
@@ -54,18 +70,16 @@ def _has_lgpio() -> bool:
 async def get_rgb_status():
     """Get RGB status and service state."""
     try:
-        config = load_config()
+        config, is_pi5, has_lgpio = read_config(), _is_pi5(), _has_lgpio()
         rgb_config = config.get("rgb", {})
 
         led_count = rgb_config.get("led_count", 93)
         led_pin = rgb_config.get("led_pin", 10)
         enabled = rgb_config.get("enabled", True)
 
-        is_pi5 = _is_pi5()
-
         # Hardware availability check
         if is_pi5 and led_pin == 10:
-            hardware_ready = _has_lgpio()
+            hardware_ready = has_lgpio
             driver_type = "lgpio"
         else:
             hardware_ready = True
@@ -101,10 +115,7 @@ async def set_rgb_enabled(request: EnableRequest):
     Changes take effect on next boot.
     """
     try:
-        config = load_config()
-        config.setdefault("rgb", {})
-        config["rgb"]["enabled"] = request.enabled
-        save_config(config)
+        await asyncio.to_thread(update_config, {"rgb": {"enabled": request.enabled}})
 
         return {
             "success": True,
@@ -126,7 +137,7 @@ async def test_rgb():
                 "error": "RGB service not running. Check that rgb.enabled=true and restart."
             }
 
-        config = load_config()
+        config = read_config()
         brightness = config.get("rgb", {}).get("led_brightness", 25)
         g.rgb_service.set_brightness(brightness)
 
@@ -141,7 +152,7 @@ async def test_rgb():
         })
 
         # Schedule clear after animation completes
-        asyncio.create_task(_clear_leds_after_delay(duration + 1.0))
+        _clear_leds_after_delay(duration + 1.0)
 
         return {
             "success": True,
@@ -165,7 +176,7 @@ async def test_rgb_welcome():
                 "error": "RGB service not running. Check that rgb.enabled=true and restart."
             }
 
-        config = load_config()
+        config = read_config()
         brightness = config.get("rgb", {}).get("led_brightness", 25)
         g.rgb_service.set_brightness(brightness)
 
@@ -177,7 +188,7 @@ async def test_rgb_welcome():
         })
 
         # Schedule clear after animation completes
-        asyncio.create_task(_clear_leds_after_delay(duration + 1.0))
+        _clear_leds_after_delay(duration + 1.0)
 
         return {
             "success": True,
@@ -191,13 +202,34 @@ async def test_rgb_welcome():
         return {"success": False, "error": str(e)}
 
 
-async def _clear_leds_after_delay(delay: float):
-    """Clear LEDs after a delay to ensure they turn off after animation."""
-    await asyncio.sleep(delay)
+def _clear_leds() -> None:
+    """Timer callback for _clear_leds_after_delay."""
+    global _pending_clear
+    _pending_clear = None
     if g.rgb_service is not None:
         g.rgb_service.clear()
 
 
+def _clear_leds_after_delay(delay: float) -> None:
+    """
+    Clear LEDs after a delay to ensure they turn off after animation.
+
+    Replaces any clear still pending from an earlier test, so repeated tests
+    don't cut the latest animation short.
+    """
+    global _pending_clear
+    _cancel_pending_clear()
+    _pending_clear = asyncio.get_running_loop().call_later(delay, _clear_leds)
+
+
+def _cancel_pending_clear() -> None:
+    """Drop a scheduled clear (the LEDs are being driven by something newer)."""
+    global _pending_clear
+    if _pending_clear is not None:
+        _pending_clear.cancel()
+        _pending_clear = None
+
+
 @router.post("/animation/{name}")
 async def play_animation(name: str, duration: float = 10.0):
     """Play a specific RGB animation."""
@@ -213,6 +245,7 @@ async def play_animation(name: str, duration: float = 10.0):
                 "available": list(available.keys())
             }
 
+        _cancel_pending_clear()
         g.rgb_service.handle_event("animation", {"name": name, "duration": duration})
         return {"success": True, "animation": name, "duration": duration}
 
@@ -224,8 +257,9 @@ async def play_animation(name: str, duration: float = 10.0):
 async def list_animations():
     """List available RGB animations."""
     try:
-        from lelamp.service.rgb.sequences import list_animations as get_anims
-        return {"success": True, "animations": get_anims()}
+        if _list_animations is None:
+            return {"success": False, "error": "RGB animations not available"}
+        return {"success": True, "animations": _list_animations()}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -237,6 +271,7 @@ async def set_color(request: ColorRequest):
         if g.rgb_service is None:
             return {"success": False, "error": "RGB service not running"}
 
+        _cancel_pending_clear()
         g.rgb_service.handle_event("solid", (request.r, request.g, request.b))
         return {"success": True, "color": {"r": request.r, "g": request.g, "b": request.b}}
 
@@ -251,6 +286,7 @@ async def turn_off():
         if g.rgb_service is None:
             return {"success": True, "message": "RGB service not running"}
 
+        _cancel_pending_clear()
         g.rgb_service.handle_event("stop_animation")
         g.rgb_service.clear()
         return {"success": True, "message": "LEDs off"}
@@ -262,7 +298,7 @@ async def turn_off():
 @router.get("/brightness")
 async def get_brightness():
     """Get brightness setting."""
-    config = load_config()
+    config = read_config()
     return {
         "success": True,
         "brightness": config.get("rgb", {}).get("led_brightness", 50)
@@ -275,10 +311,7 @@ async def set_brightness(request: BrightnessRequest):
     try:
         brightness = max(0, min(100, request.brightness))
 
-        config = load_config()
-        config.setdefault("rgb", {})
-        config["rgb"]["led_brightness"] = brightness
-        save_config(config)
+        await asyncio.to_thread(update_config, {"rgb": {"led_brightness": brightness}})
 
         if g.rgb_service:
             g.rgb_service.set_brightness(brightness)
@@ -293,13 +326,7 @@ async def set_brightness(request: BrightnessRequest):
 async def complete_rgb_setup():
     """Mark RGB setup step as complete."""
     try:
-        config = load_config()
-
-        config.setdefault("setup", {})
-        config["setup"].setdefault("steps_completed", {})
-        config["setup"]["steps_completed"]["rgb"] = True
-
-        save_config(config)
+        await asyncio.to_thread(update_config, {"setup": {"steps_completed": {"rgb": True}}})
 
         return {"success": True, "message": "RGB setup completed"}
 
@@ -311,15 +338,10 @@ async def complete_rgb_setup():
 async def skip_rgb_setup():
     """Skip RGB setup step."""
     try:
-        config = load_config()
-
-        config.setdefault("setup", {})
-        config["setup"].setdefault("steps_completed", {})
-        config["setup"]["steps_completed"]["rgb"] = True
-        config["setup"].setdefault("steps_skipped", {})
-        config["setup"]["steps_skipped"]["rgb"] = True
-
-        save_config(config)
+        await asyncio.to_thread(update_config, {"setup": {
+            "steps_completed": {"rgb": True},
+            "steps_skipped": {"rgb": True},
+        }})
 
         return {"success": True, "message": "RGB setup skipped"}
 
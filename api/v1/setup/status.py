@@ -4,11 +4,13 @@ Setup wizard status endpoints.
 Tracks the progress of the setup wizard and manages step completion.
 """
 
+import asyncio
+
 from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import Dict, Optional
 
-from api.deps import load_config, save_config
+from api.deps import edit_config, read_config, update_config
 
 router = APIRouter()
 
@@ -26,11 +28,21 @@ class StepSkip(BaseModel):
     disable_feature: str = None  # Optional feature to disable (e.g., "motors", "wifi")
 
 
+# Features a skipped step can disable: feature -> (settings to apply, message note)
+_SKIP_DISABLE = {
+    "motors": ({"enabled": False}, " - motors disabled"),
+    "wifi": ({"enabled": False, "configured": False}, " - WiFi setup skipped (local-only mode)"),
+    "agent": ({"enabled": False}, " - AI agent disabled"),
+    "face_tracking": ({"enabled": False}, " - face tracking disabled"),
+    "rgb": ({"enabled": False}, " - RGB lights disabled"),
+}
+
+
 @router.get("/status")
 async def get_setup_status():
     """Get current setup wizard status and progress."""
     try:
-        config = load_config()
+        config = read_config()
         setup = config.get('setup', {})
         return {
             "success": True,
@@ -47,10 +59,7 @@ async def get_setup_status():
 async def update_setup_step(data: StepUpdate):
     """Update current setup step."""
     try:
-        config = load_config()
-        config.setdefault('setup', {})
-        config['setup']['current_step'] = data.step
-        save_config(config)
+        await asyncio.to_thread(update_config, {'setup': {'current_step': data.step}})
         return {"success": True, "step": data.step}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -63,11 +72,7 @@ async def complete_setup_step(data: StepComplete):
         if not data.step:
             return {"success": False, "error": "No step specified"}
 
-        config = load_config()
-        config.setdefault('setup', {})
-        config['setup'].setdefault('steps_completed', {})
-        config['setup']['steps_completed'][data.step] = True
-        save_config(config)
+        await asyncio.to_thread(update_config, {'setup': {'steps_completed': {data.step: True}}})
 
         return {"success": True, "step": data.step, "completed": True}
     except Exception as e:
@@ -78,12 +83,11 @@ async def complete_setup_step(data: StepComplete):
 async def finish_setup():
     """Mark setup as complete."""
     try:
-        config = load_config()
-        config.setdefault('setup', {})
-        config['setup']['setup_complete'] = True
-        config['setup']['first_boot'] = False
-        config['setup']['current_step'] = 'complete'
-        save_config(config)
+        await asyncio.to_thread(update_config, {'setup': {
+            'setup_complete': True,
+            'first_boot': False,
+            'current_step': 'complete',
+        }})
 
         return {"success": True, "message": "Setup complete!"}
     except Exception as e:
@@ -94,8 +98,8 @@ async def finish_setup():
 async def restart_setup():
     """Restart setup wizard from beginning."""
     try:
-        config = load_config()
-        config['setup'] = {
+        # Replaces the whole section, so not a merge via update_config
+        await asyncio.to_thread(edit_config, lambda config: config.update(setup={
             'first_boot': False,
             'setup_complete': False,
             'current_step': 'welcome',
@@ -104,8 +108,7 @@ async def restart_setup():
                 'location': False,
                 'personality': False
             },
-        }
-        save_config(config)
+        }))
 
         return {"success": True, "message": "Setup wizard restarted"}
     except Exception as e:
@@ -124,14 +127,11 @@ async def skip_setup_step(data: StepSkip):
         if not data.step:
             return {"success": False, "error": "No step specified"}
 
-        config = load_config()
-        config.setdefault('setup', {})
-        config['setup'].setdefault('steps_completed', {})
-        config['setup'].setdefault('steps_skipped', {})
-
-        # Mark step as skipped (not completed)
-        config['setup']['steps_skipped'][data.step] = True
-        config['setup']['steps_completed'][data.step] = True  # Allow progression
+        # Mark step as skipped (and completed, to allow progression)
+        patch = {'setup': {
+            'steps_skipped': {data.step: True},
+            'steps_completed': {data.step: True},
+        }}
 
         # Handle feature disabling based on skip
         message = f"Skipped {data.step}"
@@ -139,33 +139,13 @@ async def skip_setup_step(data: StepSkip):
         if data.disable_feature:
             feature = data.disable_feature.lower()
 
-            if feature == "motors":
-                config.setdefault('motors', {})
-                config['motors']['enabled'] = False
-                message += " - motors disabled"
-
-            elif feature == "wifi":
-                config.setdefault('wifi', {})
-                config['wifi']['enabled'] = False
-                config['wifi']['configured'] = False
-                message += " - WiFi setup skipped (local-only mode)"
-
-            elif feature == "agent":
-                config.setdefault('agent', {})
-                config['agent']['enabled'] = False
-                message += " - AI agent disabled"
-
-            elif feature == "face_tracking":
-                config.setdefault('face_tracking', {})
-                config['face_tracking']['enabled'] = False
-                message += " - face tracking disabled"
-
-            elif feature == "rgb":
-                config.setdefault('rgb', {})
-                config['rgb']['enabled'] = False
-                message += " - RGB lights disabled"
-
-        save_config(config)
+            spec = _SKIP_DISABLE.get(feature)
+            if spec:
+                settings, note = spec
+                patch[feature] = dict(settings)
+                message += note
+
+        await asyncio.to_thread(update_config, patch)
 
         return {
             "success": True,
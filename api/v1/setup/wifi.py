@@ -8,17 +8,38 @@ Provides endpoints for:
 - Switching from AP mode to station mode
 """
 
-import subprocess
 import asyncio
+import fcntl
+import re
+import socket
+import struct
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from pydantic import BaseModel
 from fastapi import APIRouter
 
-from api.deps import load_config, save_config
+from api.deps import update_config
 
 router = APIRouter()
 
+# Linux SIOCGIFADDR ioctl and its struct ifreq buffer (name + sockaddr)
+SIOCGIFADDR = 0x8915
+_IFREQ = struct.Struct("256s")
+
+# Fixed command lines, built once
+_NMCLI_ACTIVE = ("nmcli", "connection", "show", "--active")
+_NMCLI_ACTIVE_WIFI = (
+    "nmcli", "-t", "-f", "ACTIVE,SSID,DEVICE,TYPE", "connection", "show", "--active"
+)
+_NMCLI_WIFI_LIST = (
+    "nmcli", "-t", "-f", "IN-USE,SSID,SIGNAL,SECURITY", "device", "wifi", "list"
+)
+_NMCLI_RESCAN = ("sudo", "nmcli", "device", "wifi", "rescan")
+_NMCLI_DEVICE_STATUS = ("nmcli", "device", "status")
+_NMCLI_AP_UP = ("sudo", "nmcli", "connection", "up", "lelamp-ap")
+_NMCLI_AP_DOWN = ("sudo", "nmcli", "connection", "down", "lelamp-ap")
+_RFKILL_LIST_WIFI = ("rfkill", "list", "wifi")
+
 
 # =============================================================================
 # Pydantic Models
@@ -51,20 +72,49 @@ class WifiStatus(BaseModel):
 # Helper Functions
 # =============================================================================
 
-def run_command(cmd: List[str], timeout: int = 30) -> tuple:
-    """Run a command and return (success, stdout, stderr)."""
+async def run_command(cmd: Sequence[str], timeout: int = 30) -> tuple:
+    """
+    Run a command and return (success, stdout, stderr).
+
+    Runs as an asyncio subprocess so a slow nmcli call (a connect can take up
+    to a minute) doesn't block the event loop.
+    """
+    success, stdout, stderr = await run_command_bytes(cmd, timeout)
+    return success, stdout.decode(errors="replace"), stderr
+
+
+async def run_command_bytes(cmd: Sequence[str], timeout: int = 30) -> tuple:
+    """Like run_command, but stdout is returned undecoded (bytes)."""
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
-        return result.returncode == 0, result.stdout, result.stderr
-    except subprocess.TimeoutExpired:
-        return False, "", "Command timed out"
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return False, b"", "Command timed out"
+        return proc.returncode == 0, stdout, stderr.decode(errors="replace")
     except Exception as e:
-        return False, "", str(e)
+        return False, b"", str(e)
+
+
+# One IN-USE:SSID:SIGNAL:SECURITY row of `nmcli -t` output. In terse mode
+# nmcli escapes ":" and "\" inside values with a backslash, so an SSID like
+# "Cafe:5G" arrives as "Cafe\:5G" and must not be split there.
+_NMCLI_FIELD = r"((?:[^:\\\n]|\\.)*)"
+_NMCLI_WIFI_ROW_RE = re.compile(
+    rf"^{_NMCLI_FIELD}:{_NMCLI_FIELD}:{_NMCLI_FIELD}:(.*)$", re.MULTILINE
+)
+_NMCLI_ESCAPE_RE = re.compile(r"\\(.)")
+
+
+def _nmcli_unescape(value: str) -> str:
+    """Undo nmcli's terse-mode backslash escaping."""
+    return _NMCLI_ESCAPE_RE.sub(r"\1", value) if "\\" in value else value
 
 
 def parse_nmcli_networks(output: str) -> List[WifiNetwork]:
@@ -72,48 +122,33 @@ def parse_nmcli_networks(output: str) -> List[WifiNetwork]:
     networks = []
     seen_ssids = set()
 
-    for line in output.strip().split('\n'):
-        if not line:
+    for match in _NMCLI_WIFI_ROW_RE.finditer(output):
+        in_use, ssid, signal, security = match.groups()
+
+        # Skip empty SSIDs and duplicates
+        ssid = _nmcli_unescape(ssid).strip()
+        if not ssid or ssid in seen_ssids:
             continue
 
-        # Format: IN-USE:SSID:SIGNAL:SECURITY
-        parts = line.split(':')
-        if len(parts) >= 4:
-            in_use = parts[0].strip() == '*'
-            ssid = parts[1].strip()
-            signal = parts[2].strip()
-            security = parts[3].strip() if parts[3] else "Open"
-
-            # Skip empty SSIDs and duplicates
-            if not ssid or ssid in seen_ssids:
-                continue
-
-            seen_ssids.add(ssid)
-
-            try:
-                signal_int = int(signal) if signal else 0
-            except ValueError:
-                signal_int = 0
-
-            networks.append(WifiNetwork(
-                ssid=ssid,
-                signal_strength=signal_int,
-                security=security,
-                connected=in_use,
-                in_use=in_use
-            ))
+        seen_ssids.add(ssid)
+
+        connected = in_use.strip() == '*'
+        networks.append(WifiNetwork(
+            ssid=ssid,
+            signal_strength=int(signal) if signal.isdigit() else 0,
+            security=security.strip() or "Open",
+            connected=connected,
+            in_use=connected
+        ))
 
     # Sort by signal strength (strongest first)
     networks.sort(key=lambda x: x.signal_strength, reverse=True)
     return networks
 
 
-def get_current_connection() -> Optional[dict]:
+async def get_current_connection() -> Optional[dict]:
     """Get current WiFi connection info."""
-    success, stdout, _ = run_command([
-        "nmcli", "-t", "-f", "ACTIVE,SSID,DEVICE,TYPE",
-        "connection", "show", "--active"
-    ])
+    success, stdout, _ = await run_command(_NMCLI_ACTIVE_WIFI)
 
     if not success:
         return None
@@ -132,50 +167,45 @@ def get_current_connection() -> Optional[dict]:
 
 
 def get_ip_address(interface: str = "wlan0") -> Optional[str]:
-    """Get IP address for interface."""
-    success, stdout, _ = run_command([
-        "ip", "-4", "-o", "addr", "show", interface
-    ])
-
-    if success and stdout:
-        # Parse: "2: wlan0    inet 192.168.4.1/24 brd ..."
-        for part in stdout.split():
-            if '/' in part and '.' in part:
-                return part.split('/')[0]
-
-    return None
-
-
-def is_ap_mode() -> bool:
+    """Get IPv4 address for interface (None if it has none)."""
+    # Ask the kernel directly (SIOCGIFADDR) rather than spawning `ip addr`
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        try:
+            ifreq = fcntl.ioctl(
+                sock.fileno(), SIOCGIFADDR,
+                _IFREQ.pack(interface.encode()[:15])
+            )
+        except OSError:
+            return None
+    # struct ifreq: ifr_name[16], then sockaddr_in (family, port, addr)
+    return socket.inet_ntoa(ifreq[20:24])
+
+
+async def is_ap_mode() -> bool:
     """Check if currently in AP mode."""
-    success, stdout, _ = run_command([
-        "nmcli", "connection", "show", "--active"
-    ])
-
-    if success:
-        return "lelamp-ap" in stdout
-
-    return False
+    # Only a substring test, so search the raw output without decoding it
+    success, stdout, _ = await run_command_bytes(_NMCLI_ACTIVE)
+    return success and b"lelamp-ap" in stdout
 
 
 # =============================================================================
 # API Endpoints
 # =============================================================================
 
-def check_and_fix_rfkill() -> tuple:
+async def check_and_fix_rfkill() -> tuple:
     """Check if WiFi is blocked by rfkill and attempt to fix it."""
-    success, stdout, stderr = run_command(["rfkill", "list", "wifi"])
+    success, stdout, stderr = await run_command(_RFKILL_LIST_WIFI)
 
     if not success:
         return True, "Could not check rfkill status"
 
     if "Soft blocked: yes" in stdout or "Hard blocked: yes" in stdout:
         # WiFi is blocked - try to unblock and set country
-        run_command(["sudo", "raspi-config", "nonint", "do_wifi_country", "CA"])
-        run_command(["sudo", "rfkill", "unblock", "wifi"])
+        await run_command(["sudo", "raspi-config", "nonint", "do_wifi_country", "CA"])
+        await run_command(["sudo", "rfkill", "unblock", "wifi"])
 
         # Check again
-        success2, stdout2, _ = run_command(["rfkill", "list", "wifi"])
+        success2, stdout2, _ = await run_command(_RFKILL_LIST_WIFI)
         if "Soft blocked: yes" in stdout2:
             return False, "WiFi is blocked by rfkill. Run: sudo rfkill unblock wifi"
         if "Hard blocked: yes" in stdout2:
@@ -184,9 +214,9 @@ def check_and_fix_rfkill() -> tuple:
     return True, None
 
 
-def check_wifi_interface() -> tuple:
+async def check_wifi_interface() -> tuple:
     """Check if WiFi interface exists and is available."""
-    success, stdout, stderr = run_command(["nmcli", "device", "status"])
+    success, stdout, stderr = await run_command(_NMCLI_DEVICE_STATUS)
 
     if not success:
         return False, "NetworkManager not responding"
@@ -209,7 +239,7 @@ async def scan_wifi_networks():
     """
     try:
         # Check if WiFi is blocked by rfkill
-        rfkill_ok, rfkill_error = check_and_fix_rfkill()
+        rfkill_ok, rfkill_error = await check_and_fix_rfkill()
         if not rfkill_ok:
             return {
                 "success": False,
@@ -220,7 +250,7 @@ async def scan_wifi_networks():
             }
 
         # Check if WiFi interface exists
-        iface_ok, iface_error = check_wifi_interface()
+        iface_ok, iface_error = await check_wifi_interface()
         if not iface_ok:
             return {
                 "success": False,
@@ -231,16 +261,13 @@ async def scan_wifi_networks():
             }
 
         # Trigger a rescan first
-        run_command(["sudo", "nmcli", "device", "wifi", "rescan"], timeout=10)
+        await run_command(_NMCLI_RESCAN, timeout=10)
 
         # Small delay to allow scan to complete
         await asyncio.sleep(2)
 
         # Get list of networks
-        success, stdout, stderr = run_command([
-            "nmcli", "-t", "-f", "IN-USE,SSID,SIGNAL,SECURITY",
-            "device", "wifi", "list"
-        ])
+        success, stdout, stderr = await run_command(_NMCLI_WIFI_LIST)
 
         if not success:
             return {
@@ -297,12 +324,12 @@ async def connect_to_wifi(request: WifiConnectRequest):
             cmd = ["sudo", "nmcli", "device", "wifi", "connect", ssid]
 
         # If in AP mode, disconnect AP first
-        if is_ap_mode():
-            run_command(["sudo", "nmcli", "connection", "down", "lelamp-ap"])
+        if await is_ap_mode():
+            await run_command(_NMCLI_AP_DOWN)
             await asyncio.sleep(1)
 
         # Connect to network
-        success, stdout, stderr = run_command(cmd, timeout=60)
+        success, stdout, stderr = await run_command(cmd, timeout=60)
 
         if success:
             # Wait for connection to establish
@@ -319,8 +346,8 @@ async def connect_to_wifi(request: WifiConnectRequest):
             }
         else:
             # Try to restore AP mode if connection failed
-            if is_ap_mode() is False:
-                run_command(["sudo", "nmcli", "connection", "up", "lelamp-ap"])
+            if await is_ap_mode() is False:
+                await run_command(_NMCLI_AP_UP)
 
             return {
                 "success": False,
@@ -402,15 +429,15 @@ async def configure_station_mode(request: WifiConnectRequest):
             cmd = ["sudo", "nmcli", "device", "wifi", "connect", ssid]
 
         # Disconnect AP first
-        run_command(["sudo", "nmcli", "connection", "down", "lelamp-ap"])
+        await run_command(_NMCLI_AP_DOWN)
         await asyncio.sleep(1)
 
         # Connect to station network
-        success, stdout, stderr = run_command(cmd, timeout=60)
+        success, stdout, stderr = await run_command(cmd, timeout=60)
 
         if not success:
             # Restore AP mode on failure
-            run_command(["sudo", "nmcli", "connection", "up", "lelamp-ap"])
+            await run_command(_NMCLI_AP_UP)
             return {
                 "success": False,
                 "error": stderr or "Failed to connect to network"
@@ -425,16 +452,14 @@ async def configure_station_mode(request: WifiConnectRequest):
         config_marker.touch()
 
         # 3. Disable AP service
-        run_command(["sudo", "systemctl", "disable", "lelamp-ap"])
+        await run_command(["sudo", "systemctl", "disable", "lelamp-ap"])
 
         # 4. Update config
-        config = load_config()
-        config.setdefault("setup", {})
-        config["setup"]["wifi_configured"] = True
-        config["setup"]["wifi_ssid"] = ssid
-        config["setup"]["steps_completed"] = config["setup"].get("steps_completed", {})
-        config["setup"]["steps_completed"]["wifi"] = True
-        save_config(config)
+        await asyncio.to_thread(update_config, {"setup": {
+            "wifi_configured": True,
+            "wifi_ssid": ssid,
+            "steps_completed": {"wifi": True},
+        }})
 
         # Get new IP
         ip = get_ip_address()
@@ -462,13 +487,11 @@ async def enable_ap_mode():
     """
     try:
         # Disconnect from current network
-        run_command(["sudo", "nmcli", "device", "disconnect", "wlan0"])
+        await run_command(["sudo", "nmcli", "device", "disconnect", "wlan0"])
         await asyncio.sleep(1)
 
         # Start AP
-        success, _, stderr = run_command([
-            "sudo", "nmcli", "connection", "up", "lelamp-ap"
-        ])
+        success, _, stderr = await run_command(_NMCLI_AP_UP)
 
         if success:
             ip = get_ip_address()
@@ -496,10 +519,8 @@ async def disable_ap_mode():
     Disable AP mode.
     """
     try:
-        if is_ap_mode():
-            success, _, stderr = run_command([
-                "sudo", "nmcli", "connection", "down", "lelamp-ap"
-            ])
+        if await is_ap_mode():
+            success, _, stderr = await run_command(_NMCLI_AP_DOWN)
 
             if success:
                 return {"success": True, "message": "AP mode disabled"}
@@ -530,7 +551,7 @@ async def get_ap_info():
             "ap_ssid": f"lelamp_{serial}",
             "ap_password": "lelamp",
             "ap_ip": "192.168.4.1",
-            "is_active": is_ap_mode()
+            "is_active": await is_ap_mode()
         }
 
     except Exception as e:
@@ -550,21 +571,15 @@ async def skip_wifi_setup():
     (or none if in AP mode).
     """
     try:
-        config = load_config()
-
-        # Mark WiFi setup as skipped
-        config.setdefault("setup", {})
-        config["setup"].setdefault("steps_completed", {})
-        config["setup"].setdefault("steps_skipped", {})
-        config["setup"]["steps_completed"]["wifi"] = True
-        config["setup"]["steps_skipped"]["wifi"] = True
-
-        # Mark WiFi as not configured (local-only mode)
-        config.setdefault("wifi", {})
-        config["wifi"]["configured"] = False
-        config["wifi"]["skipped"] = True
-
-        save_config(config)
+        await asyncio.to_thread(update_config, {
+            # Mark WiFi setup as skipped
+            "setup": {
+                "steps_completed": {"wifi": True},
+                "steps_skipped": {"wifi": True},
+            },
+            # Mark WiFi as not configured (local-only mode)
+            "wifi": {"configured": False, "skipped": True},
+        })
 
         return {
             "success": True,
@@ -4,6 +4,7 @@ Spotify API endpoints.
 All /api/v1/spotify/* routes for Spotify OAuth and playback control.
 """
 
+import asyncio
 import os
 import logging
 import socket
@@ -13,7 +14,7 @@ from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 from dotenv import load_dotenv
 
-from api.deps import get_spotify_service, load_config, save_config, get_config
+from api.deps import get_spotify_service, update_config, get_config
 from lelamp.user_data import get_env_path, USER_ENV_FILE
 import lelamp.globals as g
 
@@ -314,11 +315,7 @@ async def update_raspotify_device_name(request: Request):
             return {"success": False, "error": "Device name cannot be empty"}
 
         # Update config.yaml
-        config = load_config()
-        if "spotify" not in config:
-            config["spotify"] = {}
-        config["spotify"]["device_name"] = device_name
-        save_config(config)
+        await asyncio.to_thread(update_config, {"spotify": {"device_name": device_name}})
 
         # Update g.CONFIG too
         if g.CONFIG:
@@ -6,6 +6,7 @@ This module contains location-related function tools including:
 - Getting current location
 """
 
+import asyncio
 import logging
 import httpx
 from lelamp.service.agent.tools import Tool
@@ -38,7 +39,7 @@ class LocationFunctions:
             Confirmation message with location details or error
         """
         from lelamp.globals import CONFIG
-        from api.deps import load_config, save_config
+        from api.deps import edit_config
 
         print(f"LeLamp: set_location called with city={city}")
 
@@ -94,8 +95,7 @@ class LocationFunctions:
                 logging.warning("timezonefinder not installed, using UTC")
 
             # Update config
-            config = load_config()
-            config['location'] = {
+            location = {
                 'city': city_name,
                 'region': region,
                 'country': country,
@@ -103,10 +103,12 @@ class LocationFunctions:
                 'lat': lat,
                 'lon': lon
             }
-            save_config(config)
+            await asyncio.to_thread(
+                edit_config, lambda config: config.update(location=location)
+            )
 
             # Update globals
-            CONFIG['location'] = config['location']
+            CONFIG['location'] = location
 
             # Try to update system timezone
             try:
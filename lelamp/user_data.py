@@ -24,6 +24,7 @@ import subprocess
 from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -223,12 +224,14 @@ def init_user_data():
 # Device Identity Functions
 # =============================================================================
 
+@lru_cache(maxsize=1)
 def get_device_serial() -> str:
     """
     Read device serial number from hardware.
 
     IMPORTANT: Always reads from hardware, never trusts stored values.
-    This prevents spoofing of device identity.
+    This prevents spoofing of device identity. The serial can't change
+    while running, so it is read once per process.
 
     Returns:
         Device serial number (e.g., "a3b381c95fcefbc0") or "unknown" if not available
@@ -244,6 +247,7 @@ def get_device_serial() -> str:
     return "unknown"
 
 
+@lru_cache(maxsize=1)
 def get_device_serial_short() -> str:
     """
     Get the last 8 characters of the device serial.
@@ -433,10 +437,13 @@ def get_device_info() -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=1)
 def get_lelamp_version() -> str:
     """
     Get LeLamp software version from pyproject.toml or git.
 
+    Cached for the life of the process.
+
     Returns:
         Version string (e.g., "3.0.0" or "dev-abc1234")
     """